@@ -15,25 +15,13 @@
 # this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import re
+from basicunit import BasicUnit
 from colors import Color
-import pendulum
+from dates import parse_date
 from unit import Unit
 
 
 class Application:
-    column_names = [
-        "App",
-        "Version",
-        "Status",
-        "Scale",
-        "Charm",
-        "Store",
-        "Rev",
-        "OS",
-        "Series",
-        "Message",
-        "Notes",
-    ]
 
     def __init__(self, appname, appinfo="", model=""):
         """
@@ -42,8 +30,9 @@ class Application:
         """
         # Default Values
         self.notes = []
-        self.units = {}
-        self.subordinates = {}
+        self.unitsinfo = {}
+        self._units = None
+        self._subordinates = {}
         self.version = ""
         self.message = ""
         self.endpointbindings = {}
@@ -104,13 +93,7 @@ class Application:
         if "exposed" in appinfo:
             self.exposed = appinfo["exposed"]
 
-        if "application-status" in appinfo:
-            statuskey = "application-status"
-        elif "service-status" in appinfo:
-            statuskey = "service-status"
-        else:
-            statuskey = "none"
-
+        statuskey = Application.get_statuskey(appinfo)
         if statuskey in appinfo and "current" in appinfo[statuskey]:
             self.status = appinfo[statuskey]["current"]
         else:
@@ -119,18 +102,8 @@ class Application:
         # Required Dates
 
         if statuskey in appinfo and "since" in appinfo[statuskey]:
-            if re.match(r".*Z$", appinfo[statuskey]["since"]):
-                appinfo[statuskey]["since"] = re.sub(r"Z$", "", appinfo[statuskey]["since"])
-                self.since = pendulum.from_format(
-                    appinfo[statuskey]["since"],
-                    "DD MMM YYYY HH:mm:ss",
-                    tz="UTC",
-                )
-            else:
-                self.since = pendulum.from_format(
-                    appinfo[statuskey]["since"], "DD MMM YYYY HH:mm:ssZ"
-                )
-            model.controller.update_timestamp(self.since)
+            self.since = parse_date(appinfo[statuskey]["since"])
+            model.controller.record_date(self.since)
 
         # Optional Variables
         if statuskey in appinfo:
@@ -164,25 +137,106 @@ class Application:
             if self.charmorigin != "jujucharms":
                 self.notes.append("Not from Charm Store")
 
-        # Handle Units
+        # Units are only created when they are first used, the controller
+        # still needs the unit dates to work out its timestamp
         if "units" in appinfo:
-            for unitname, unitinfo in appinfo["units"].items():
-                unit = Unit(unitname, unitinfo, self)
-                self.units[unitname] = unit
+            self.unitsinfo = appinfo["units"]
+            model.controller.add_date_source(self.record_unit_dates)
+        self.unitcount = len(self.unitsinfo)
+
+    @staticmethod
+    def get_statuskey(appinfo):
+        """Return the key of the application status, this differs by version"""
+        if "application-status" in appinfo:
+            return "application-status"
+        elif "service-status" in appinfo:
+            return "service-status"
+        return "none"
+
+    @staticmethod
+    def record_dates(appinfo, controller):
+        """
+        Record the dates of an application and its units with the controller
+        without creating the objects
+        """
+        statuskey = Application.get_statuskey(appinfo)
+        if statuskey in appinfo and "since" in appinfo[statuskey]:
+            controller.record_date(parse_date(appinfo[statuskey]["since"]))
+        for unitinfo in appinfo.get("units", {}).values():
+            BasicUnit.record_dates(unitinfo, controller)
 
-    def __dict__(self):
-        return {self.name: self}
+    @property
+    def units(self):
+        """The units of this application keyed by unit name"""
+        if self._units is None:
+            self.create_units()
+        return self._units
+
+    @units.setter
+    def units(self, units):
+        self._units = units
+
+    @property
+    def subordinates(self):
+        """
+        The subordinate units of this application, these are attached from
+        the units of other applications so they all have to be created
+        """
+        self.model.link_subordinates()
+        return self._subordinates
+
+    @subordinates.setter
+    def subordinates(self, subordinates):
+        self._subordinates = subordinates
+
+    def create_units(self, unit_filter=None):
+        """
+        Create the units matching a compiled filter, or all of them, the
+        dates of the units left out are recorded with the controller
+        """
+        self._units = {}
+        for unitname, unitinfo in self.unitsinfo.items():
+            if unit_filter is None or unit_filter(unitname):
+                self._units[unitname] = Unit(unitname, unitinfo, self)
+            else:
+                BasicUnit.record_dates(unitinfo, self.model.controller)
+        self.unitsinfo = {}
+
+    def record_unit_dates(self, controller):
+        """Record the dates of units which have not been created yet"""
+        for unitinfo in self.unitsinfo.values():
+            BasicUnit.record_dates(unitinfo, controller)
 
     def add_subordinate(self, subunit):
         """Add a subordinate relationship"""
-        self.subordinates[subunit.name] = subunit
+        self._subordinates[subunit.name] = subunit
+
+    def get_unit_names(self):
+        """Return the names of the units without creating them"""
+        if self._units is None:
+            return self.unitsinfo.keys()
+        return self._units.keys()
+
+    def get_subordinate_names(self):
+        """Return the names of the subordinate units without creating them"""
+        if self.model.subordinateslinked:
+            return self._subordinates.keys()
+        return self.model.subordinateunits.get(self.name, ())
+
+    def get_unit_count(self):
+        """Return the number of units without creating them"""
+        return len(self.get_unit_names())
 
     def get_scale(self):
         """
         Return the scale of an application which is the number of units and/or
         subordinate units
         """
-        return len(self.units) + len(self.subordinates)
+        if self.model.subordinateslinked:
+            subordinatecount = len(self._subordinates)
+        else:
+            subordinatecount = self.model.get_subordinate_count(self.name)
+        return self.get_unit_count() + subordinatecount
 
     # TODO These colors should return a color not a string
     def get_status_color(self):
@@ -229,62 +283,17 @@ class Application:
         else:
             return self.charmorigin
 
-    def get_row(
-        self, color, include_controller_name=False, include_model_name=False
-    ):
-        """Return a list which can be used for a row in a table."""
-
-        row = []
-        if color:
-            row = [
-                self.name,
-                self.version,
-                self.get_status_color(),
-                self.get_scale_color(),
-                self.charm,
-                self.get_charmorigin_color(),
-                self.get_charmrev_color(),
-                self.os,
-                self.series,
-                self.message,
-                ", ".join(self.notes),
-            ]
-        else:
-            row = [
-                self.name,
-                self.version,
-                self.status,
-                str(self.get_scale()),
-                self.charm,
-                self.charmorigin,
-                str(self.charmrev),
-                self.os,
-                self.series,
-                self.message,
-                ", ".join(self.notes),
-            ]
-        if include_model_name:
-            row.insert(0, self.model.name)
-        if include_controller_name:
-            row.insert(0, self.model.controller.name)
-        return row
-
-    def get_column_names(
-        self, include_controller_name=False, include_model_name=False
-    ):
-        """Append the controller name and/or model name as necessary"""
-        if include_model_name:
-            self.column_names.insert(0, "Model")
-        if include_controller_name:
-            self.column_names.insert(0, "Controller")
-        return self.column_names
-
     def filter_dictionary(self, dictionary, key_filter):
+        """Keep the items whose key matches a compiled filter"""
         return {
             key: value
             for (key, value) in dictionary.items()
-            if key_filter in key
+            if key_filter(key)
         }
 
     def filter_units(self, unit_filter):
-        self.units = self.filter_dictionary(self.units, unit_filter)
+        if self._units is None:
+            # Only create the units which are going to be kept
+            self.create_units(unit_filter)
+        else:
+            self.units = self.filter_dictionary(self.units, unit_filter)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import io
+import os
+import re
+import sys
+
+# Compressed or not, tarfile works out which from the stream
+ARCHIVE_SUFFIXES = (
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+)
+# Members worth a look, such as sos_commands/juju/juju_status_--format_json
+# from the sosreport juju plugin or any json or yaml file
+STATUS_MEMBER_RE = re.compile(r"juju[_-]?status|\.(json|ya?ml)$", re.I)
+# A juju status starts with one of these keys, yaml or json
+STATUS_HEADER_RE = re.compile(
+    r"\A\s*\{?\s*[\"']?(model|environment|machines|applications|services)"
+    r"[\"']?\s*:"
+)
+SNIFF_SIZE = 4096
+# Bigger members are skipped rather than read into memory
+MAX_MEMBER_SIZE = 512 * 1024 * 1024
+
+
+class StatusMember(io.StringIO):
+    """A status file read from an archive, named after both"""
+
+    def __init__(self, text, archive, membername):
+        super().__init__(text)
+        self.archive = archive
+        self.name = "{}:{}".format(archive, membername)
+
+
+def is_archive(filename):
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def is_status_member(member):
+    """Return True if a tar member is named like a status file might be"""
+    return (
+        member.isfile()
+        and 0 < member.size <= MAX_MEMBER_SIZE
+        and STATUS_MEMBER_RE.search(os.path.basename(member.name)) is not None
+    )
+
+
+def iter_archive_status_files(filename):
+    """
+    Yield the members of an archive which look like juju status files as
+    text files named after the archive and the member.  The archive is read
+    as a stream, one member at a time, and members are only read in full if
+    their name and first few KB look like a juju status.  Raises a ValueError
+    if the archive can't be read
+    """
+    import tarfile
+
+    try:
+        with tarfile.open(filename, "r|*") as archive:
+            for member in archive:
+                if not is_status_member(member):
+                    continue
+                memberfile = archive.extractfile(member)
+                header = memberfile.read(SNIFF_SIZE)
+                if not STATUS_HEADER_RE.match(
+                    header.decode("utf-8", errors="replace")
+                ):
+                    continue
+                data = header + memberfile.read()
+                yield StatusMember(
+                    data.decode("utf-8", errors="replace"),
+                    filename,
+                    member.name,
+                )
+    except Exception as error:
+        # Corrupt or truncated archives fail in the compression library or
+        # tarfile, with all sorts of exceptions
+        raise ValueError(
+            "Error reading archive {}: {}".format(filename, error)
+        )
+
+
+def is_status(rawstatus):
+    """
+    Return True if a parsed archive member is a juju status rather than some
+    other file which looked like one
+    """
+    return "machines" in rawstatus and (
+        "applications" in rawstatus or "services" in rawstatus
+    )
+
+
+def iter_status_files(inputfiles, verbose=False):
+    """
+    Yield each of the status files, archives are replaced by the status files
+    found in them
+    """
+    for inputfile in inputfiles:
+        if not is_archive(inputfile.name):
+            yield inputfile
+            continue
+        inputfile.close()
+        found = 0
+        for statusfile in iter_archive_status_files(inputfile.name):
+            found += 1
+            yield statusfile
+        if verbose:
+            print(
+                "{} members of {} looked like status files".format(
+                    found, inputfile.name
+                ),
+                file=sys.stderr,
+            )
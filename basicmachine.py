@@ -14,10 +14,10 @@
 # You should have received a copy of the GNU General Public License along with
 # this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import re
 from colors import Color
+from dates import parse_date
+from empty import EMPTY_DICT, EMPTY_LIST
 from networkinterface import NetworkInterface
-import pendulum
 
 
 class BasicMachine:
@@ -26,20 +26,23 @@ class BasicMachine:
     attributes and functions remain here
     """
 
-    column_names = [
-        "Machine",
-        "Agent",
-        "Status",
-        "DNS",
-        "Inst id",
-        "Series",
-        "AZ",
-        "Arch",
-        "Cores",
-        "Memory",
-        "Message",
-        "Notes",
-    ]
+    __slots__ = (
+        "notes",
+        "networkinterfacesinfo",
+        "_networkinterfaces",
+        "name",
+        "jujustatus",
+        "jujuversion",
+        "dnsname",
+        "ipaddresses",
+        "instanceid",
+        "machinestatus",
+        "machinemessage",
+        "series",
+        "model",
+        "jujusince",
+        "machinesince",
+    )
 
     def __init__(self, name, info, model):
         """
@@ -47,8 +50,9 @@ class BasicMachine:
         container object from a juju status output
         """
         # Default Values
-        self.notes = []
-        self.networkinterfaces = {}
+        self.notes = EMPTY_LIST
+        self.networkinterfacesinfo = EMPTY_DICT
+        self._networkinterfaces = None
 
         # Required Variables
         self.name = name
@@ -84,43 +88,47 @@ class BasicMachine:
 
         # Required Dates
         if "juju-status" in info:
-            if re.match(r".*Z$", info["juju-status"]["since"]):
-                info["juju-status"]["since"] = re.sub(r"Z$", "", info["juju-status"]["since"])
-                self.jujusince = pendulum.from_format(
-                    info["juju-status"]["since"],
-                    "DD MMM YYYY HH:mm:ss",
-                    tz="UTC",
-                )
-            else:
-                self.jujusince = pendulum.from_format(
-                    info["juju-status"]["since"], "DD MMM YYYY HH:mm:ssZ"
-                )
-            model.controller.update_timestamp(self.jujusince)
+            self.jujusince = parse_date(info["juju-status"]["since"])
+            model.controller.record_date(self.jujusince)
         if "machine-status" in info:
-            if re.match(r".*Z$", info["machine-status"]["since"]):
-                info["machine-status"]["since"] = re.sub(r"Z$", "", info["machine-status"]["since"])
-                self.machinesince = pendulum.from_format(
-                    info["machine-status"]["since"],
-                    "DD MMM YYYY HH:mm:ss",
-                    tz="UTC",
-                )
-            else:
-                self.machinesince = pendulum.from_format(
-                    info["machine-status"]["since"], "DD MMM YYYY HH:mm:ssZ"
-                )
-            model.controller.update_timestamp(self.machinesince)
+            self.machinesince = parse_date(info["machine-status"]["since"])
+            model.controller.record_date(self.machinesince)
 
-        # Handle Network Interfaces
+        # Network Interfaces are only created when they are first used
         if "network-interfaces" in info:
-            for interfacename, interfaceinfo in info[
-                "network-interfaces"
-            ].items():
-                self.networkinterfaces[interfacename] = NetworkInterface(
-                    interfacename, interfaceinfo, self, model
+            self.networkinterfacesinfo = info["network-interfaces"]
+
+    @property
+    def networkinterfaces(self):
+        """The network interfaces of this machine keyed by interface name"""
+        if self._networkinterfaces is None:
+            self._networkinterfaces = {}
+            for interfacename, interfaceinfo in (
+                self.networkinterfacesinfo.items()
+            ):
+                self._networkinterfaces[interfacename] = NetworkInterface(
+                    interfacename, interfaceinfo, self, self.model
                 )
+            self.networkinterfacesinfo = EMPTY_DICT
+        return self._networkinterfaces
 
-    def __dict__(self):
-        return {self.name: self}
+    @networkinterfaces.setter
+    def networkinterfaces(self, networkinterfaces):
+        self._networkinterfaces = networkinterfaces
+
+    @staticmethod
+    def record_dates(info, controller):
+        """
+        Record the dates of a machine and its containers with the controller
+        without creating the objects
+        """
+        if "juju-status" in info:
+            controller.record_date(parse_date(info["juju-status"]["since"]))
+        if "machine-status" in info:
+            controller.record_date(parse_date(info["machine-status"]["since"]))
+        if "containers" in info:
+            for containerinfo in info["containers"].values():
+                BasicMachine.record_dates(containerinfo, controller)
 
     def get_jujustatus_color(self):
         """Return a status string with correct colors based on juju status"""
@@ -145,13 +153,3 @@ class BasicMachine:
             return self.machinestatus
         else:
             return Color.Fg.Yellow + self.machinestatus + Color.Reset
-
-    def get_column_names(
-        self, include_controller_name=False, include_model_name=False
-    ):
-        """Append the controller name and/or model name as necessary"""
-        if include_model_name:
-            self.column_names.insert(0, "Model")
-        if include_controller_name:
-            self.column_names.insert(0, "Controller")
-        return self.column_names
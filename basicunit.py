@@ -14,9 +14,9 @@
 # You should have received a copy of the GNU General Public License along with
 # this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import re
 from colors import Color
-import pendulum
+from dates import parse_date
+from empty import EMPTY_LIST
 
 
 class BasicUnit:
@@ -25,16 +25,19 @@ class BasicUnit:
     attributes and functions remain here
     """
 
-    column_names = [
-        "Unit",
-        "Workload",
-        "Agent",
-        "Machine",
-        "Public address",
-        "Ports",
-        "Message",
-        "Notes",
-    ]
+    __slots__ = (
+        "notes",
+        "openports",
+        "message",
+        "leader",
+        "name",
+        "workloadstatus",
+        "jujustatus",
+        "jujuversion",
+        "publicaddress",
+        "workloadsince",
+        "jujusince",
+    )
 
     def __init__(self, name, info, controller):
         """
@@ -42,21 +45,15 @@ class BasicUnit:
         subordinate object from a juju status output
         """
         # Default Values
-        self.notes = []
-        self.openports = []
-        self.subordinates = {}
+        self.notes = EMPTY_LIST
+        self.openports = EMPTY_LIST
         self.message = ""
         self.leader = False
 
         # Required Variables
         self.name = name
         self.workloadstatus = info["workload-status"]["current"]
-        if "juju-status" in info:
-            statuskey = "juju-status"
-        elif "agent-status" in info:
-            statuskey = "agent-status"
-        else:
-            statuskey = "none"
+        statuskey = BasicUnit.get_statuskey(info)
         self.jujustatus = info[statuskey]["current"]
         if "version" in info[statuskey]:
             self.jujuversion = info[statuskey]["version"]
@@ -65,31 +62,13 @@ class BasicUnit:
         else:
             self.publicaddress = "PENDING"
         if "message" in info[statuskey]:
-            self.notes.append(info[statuskey]["message"])
+            self.notes = [info[statuskey]["message"]]
 
         # Required Dates
-        if re.match(r".*Z$", info["workload-status"]["since"]):
-            info["workload-status"]["since"] = re.sub(r"Z$", "", info["workload-status"]["since"])
-            self.workloadsince = pendulum.from_format(
-                info["workload-status"]["since"],
-                "DD MMM YYYY HH:mm:ss",
-                tz="UTC",
-            )
-        else:
-            self.workloadsince = pendulum.from_format(
-                info["workload-status"]["since"], "DD MMM YYYY HH:mm:ssZ"
-            )
-        controller.update_timestamp(self.workloadsince)
-        if re.match(r".*Z$", info[statuskey]["since"]):
-            info[statuskey]["since"] = re.sub(r"Z$", "", info[statuskey]["since"])
-            self.jujusince = pendulum.from_format(
-                info[statuskey]["since"], "DD MMM YYYY HH:mm:ss", tz="UTC"
-            )
-        else:
-            self.jujusince = pendulum.from_format(
-                info[statuskey]["since"], "DD MMM YYYY HH:mm:ssZ"
-            )
-        controller.update_timestamp(self.jujusince)
+        self.workloadsince = parse_date(info["workload-status"]["since"])
+        controller.record_date(self.workloadsince)
+        self.jujusince = parse_date(info[statuskey]["since"])
+        controller.record_date(self.jujusince)
 
         # Optional Variables
         if "message" in info["workload-status"]:
@@ -99,8 +78,27 @@ class BasicUnit:
         if "leader" in info:
             self.leader = info["leader"]
 
-    def __dict__(self):
-        return {self.name: self}
+    @staticmethod
+    def get_statuskey(info):
+        """Return the key of the agent status, this differs between versions"""
+        if "juju-status" in info:
+            return "juju-status"
+        elif "agent-status" in info:
+            return "agent-status"
+        return "none"
+
+    @staticmethod
+    def record_dates(info, controller):
+        """
+        Record the dates of a unit and its subordinates with the controller
+        without creating the objects
+        """
+        controller.record_date(parse_date(info["workload-status"]["since"]))
+        statuskey = BasicUnit.get_statuskey(info)
+        controller.record_date(parse_date(info[statuskey]["since"]))
+        if "subordinates" in info:
+            for subunitinfo in info["subordinates"].values():
+                BasicUnit.record_dates(subunitinfo, controller)
 
     def get_workloadstatus_color(self):
         """
@@ -127,13 +125,3 @@ class BasicUnit:
             return Color.Fg.Red + self.jujustatus + Color.Reset
         else:
             return Color.Fg.Yellow + self.jujustatus + Color.Reset
-
-    def get_column_names(
-        self, include_controller_name=False, include_model_name=False
-    ):
-        """Append the controller name and/or model name as necessary"""
-        if include_model_name:
-            self.column_names.insert(0, "Model")
-        if include_controller_name:
-            self.column_names.insert(0, "Controller")
-        return self.column_names
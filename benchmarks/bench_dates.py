@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Micro-benchmark of the status date parser against the original pendulum
+from_format path, run from the top of the repository:
+
+    python3 benchmarks/bench_dates.py [status files]
+"""
+
+import re
+import sys
+import timeit
+import common  # noqa: F401
+import dates
+import pendulum
+from statusfile import parse_status
+
+default_files = [
+    "examples/example1.json",
+    "examples/example3.yaml",
+    "examples/example6.json",
+]
+
+
+def pendulum_parse(datestr):
+    """The parser every entity class used before the dates module"""
+    if re.match(r".*Z$", datestr):
+        datestr = re.sub(r"Z$", "", datestr)
+        return pendulum.from_format(datestr, "DD MMM YYYY HH:mm:ss", tz="UTC")
+    return pendulum.from_format(datestr, "DD MMM YYYY HH:mm:ssZ")
+
+
+def collect_dates(node, found):
+    """Collect every "since" value in a raw status"""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "since" and isinstance(value, str):
+                found.append(value)
+            else:
+                collect_dates(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            collect_dates(value, found)
+    return found
+
+
+def main(filenames):
+    datestrs = []
+    for filename in filenames:
+        with open(filename) as statusfile:
+            collect_dates(parse_status(statusfile.read()), datestrs)
+    print(
+        "{} dates, {} unique".format(len(datestrs), len(set(datestrs)))
+    )
+
+    for datestr in set(datestrs):
+        expected = pendulum_parse(datestr)
+        parsed = dates.parse_date(datestr)
+        assert parsed == expected, datestr
+        assert parsed.utcoffset() == expected.utcoffset(), datestr
+
+    def run_pendulum():
+        for datestr in datestrs:
+            pendulum_parse(datestr)
+
+    def run_uncached():
+        for datestr in datestrs:
+            dates.parse_date.__wrapped__(datestr)
+
+    def run_cached():
+        dates.parse_date.cache_clear()
+        for datestr in datestrs:
+            dates.parse_date(datestr)
+
+    for name, func in (
+        ("pendulum from_format", run_pendulum),
+        ("fixed format", run_uncached),
+        ("fixed format + memo", run_cached),
+    ):
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        print(
+            "{:<22} {:8.2f} ms  {:6.2f} us/date".format(
+                name, best * 1000, best * 1e6 / len(datestrs)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or default_files)
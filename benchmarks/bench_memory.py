@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Report the memory used per entity once every part of a status file has been
+built, run from the top of the repository:
+
+    python3 benchmarks/bench_memory.py [--copies N] [--results FILE]
+        [--compare FILE] [status files]
+
+With --compare the exit status is 1 if an entity or the whole run used more
+memory than the threshold compared to an earlier results file, such as one
+written with --results before a change
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from common import load_xjs
+import dates
+from xjsversion import __version__
+
+default_files = [
+    "examples/example1.json",
+    "examples/example3.yaml",
+    "examples/example6.json",
+]
+entity_classes = (
+    "Unit",
+    "SubordinateUnit",
+    "Machine",
+    "Container",
+    "NetworkInterface",
+    "Relation",
+)
+container_types = (list, dict, set, tuple)
+# The least change in bytes that can count as a regression, smaller changes
+# are noise
+metrics = (
+    ("bytes_per_object", 8),
+    ("retained_bytes", 256 * 1024),
+    ("peak_bytes", 256 * 1024),
+)
+
+
+def build_everything(xjs):
+    """Touch every lazily built part of the loaded models"""
+    for controller in xjs.controllers.values():
+        controller.timestamp
+        for model in controller.models.values():
+            model.relations
+            for application in model.applications.values():
+                application.subordinates
+                for unit in application.units.values():
+                    unit.subordinates
+            for machine in list(model.machines.values()) + list(
+                model.containers.values()
+            ):
+                machine.networkinterfaces
+
+
+def get_attributes(entity):
+    """Return the values stored on an entity, from slots and/or __dict__"""
+    values = []
+    for cls in type(entity).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if hasattr(entity, slot):
+                values.append(getattr(entity, slot))
+    if hasattr(entity, "__dict__") and isinstance(entity.__dict__, dict):
+        values.extend(entity.__dict__.values())
+    return values
+
+
+def get_entity_size(entity, seen):
+    """
+    Return the bytes an entity owns, the object itself, its instance
+    dictionary and any containers it doesn't share with another object
+    """
+    size = sys.getsizeof(entity)
+    if hasattr(entity, "__dict__") and isinstance(entity.__dict__, dict):
+        size += sys.getsizeof(entity.__dict__)
+    for value in get_attributes(entity):
+        if isinstance(value, container_types) and id(value) not in seen:
+            seen.add(id(value))
+            size += sys.getsizeof(value)
+    return size
+
+
+def build_copies(xjs, statusfiles, texts, copies):
+    """Load and build every status file the given number of times"""
+    for copy in range(copies):
+        # Every copy is a separate controller so the model names can repeat
+        for filename, text in zip(statusfiles, texts):
+            model = xjs.build_model(xjs.parse_status(text, name=filename))
+            model.controller.name += "-{}".format(copy)
+            xjs.add_model(model)
+        build_everything(xjs)
+
+
+def compare(results, previous, threshold):
+    """
+    Print how each entity and the whole run compare to a previous run and
+    return the number which used more memory by more than the threshold
+    """
+    before = {result["name"]: result for result in previous["results"]}
+    regressions = 0
+    for result in results:
+        for metric, minimum in metrics:
+            if metric not in result:
+                continue
+            beforevalue = before.get(result["name"], {}).get(metric, 0)
+            if beforevalue <= 0:
+                continue
+            value = result[metric]
+            ratio = value / beforevalue
+            flag = ""
+            if ratio > threshold and value - beforevalue > minimum:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(
+                "{:<18} {:<16} {:>12.1f} -> {:>12.1f} {:6.2f}x{}".format(
+                    result["name"], metric, beforevalue, value, ratio, flag
+                )
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=20)
+    parser.add_argument("--results", help="Write the results to this file")
+    parser.add_argument("--compare", help="Compare with this results file")
+    parser.add_argument("--threshold", type=float, default=1.05)
+    parser.add_argument("statusfiles", nargs="*", default=default_files)
+    args = parser.parse_args()
+
+    xjs = load_xjs()
+    texts = []
+    for filename in args.statusfiles:
+        with open(filename) as statusfile:
+            texts.append(statusfile.read())
+
+    # Build a copy first so the modules imported on first use aren't
+    # counted, then forget it and the dates it parsed
+    build_copies(xjs, args.statusfiles, texts, 1)
+    xjs.controllers = {}
+    dates.parse_date.cache_clear()
+    gc.collect()
+    tracemalloc.start()
+    build_copies(xjs, args.statusfiles, texts, args.copies)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seen = set()
+    sizes = {}
+    for entity in gc.get_objects():
+        name = type(entity).__name__
+        if name in entity_classes:
+            count, total = sizes.get(name, (0, 0))
+            sizes[name] = (count + 1, total + get_entity_size(entity, seen))
+
+    print(
+        "{:<18} {:>8} {:>12} {:>10}".format(
+            "Entity", "Count", "Bytes", "Bytes/obj"
+        )
+    )
+    results = []
+    for name in entity_classes:
+        count, total = sizes.get(name, (0, 0))
+        results.append(
+            {
+                "name": name,
+                "count": count,
+                "bytes": total,
+                "bytes_per_object": total / count if count else 0,
+            }
+        )
+        print(
+            "{:<18} {:>8} {:>12} {:>10.1f}".format(
+                name, count, total, results[-1]["bytes_per_object"]
+            )
+        )
+    results.append(
+        {"name": "total", "retained_bytes": current, "peak_bytes": peak}
+    )
+    print(
+        "Retained {:.1f} MiB, peak {:.1f} MiB for {} copies".format(
+            current / 2 ** 20, peak / 2 ** 20, args.copies
+        )
+    )
+
+    if args.results:
+        with open(args.results, "w") as resultsfile:
+            json.dump(
+                {
+                    "xjs": __version__,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "copies": args.copies,
+                    "statusfiles": args.statusfiles,
+                    "results": results,
+                },
+                resultsfile,
+                indent=1,
+            )
+            resultsfile.write("\n")
+
+    if args.compare:
+        with open(args.compare) as previousfile:
+            previous = json.load(previousfile)
+        if previous.get("copies") != args.copies or previous.get(
+            "statusfiles"
+        ) != args.statusfiles:
+            print(
+                "Warning the results compared with are for other copies or "
+                "status files",
+                file=sys.stderr,
+            )
+        if compare(results, previous, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
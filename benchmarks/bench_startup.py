@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Measure the cold start of the xjs command, the wall time of whole runs and
+the import time reported by python -X importtime, run from the top of the
+repository:
+
+    python3 benchmarks/bench_startup.py [--runs N] [--budget MS]
+
+With --budget the exit status is 1 if the median run of any command takes
+longer than that many milliseconds
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from common import topdir
+
+commands = (
+    ("help", ["--help"]),
+    ("offline json", ["--offline", "--no-cache", "examples/example2.json"]),
+)
+
+
+def parse_importtime(stderr):
+    """
+    Return the total import time and the cumulative time of each top level
+    import, in microseconds, from the output of -X importtime
+    """
+    total = 0
+    toplevel = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        selftime, cumulative, name = line.partition(":")[2].split("|")
+        if not selftime.strip().isdigit():
+            # The header line
+            continue
+        total += int(selftime)
+        if not name.startswith("  "):
+            toplevel[name.strip()] = int(cumulative)
+    return total, toplevel
+
+
+def run(arguments, env):
+    """Run xjs once and return the wall time and the import times"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.join(topdir, "xjs")]
+        + arguments,
+        cwd=topdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(
+            "xjs {} failed: {}".format(" ".join(arguments), result.stderr)
+        )
+    return (wall,) + parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=None)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    overbudget = False
+    with tempfile.TemporaryDirectory() as cachehome:
+        env = dict(os.environ, XDG_CACHE_HOME=cachehome)
+        for name, arguments in commands:
+            # The first run warms up the OS file cache
+            run(arguments, env)
+            runs = [run(arguments, env) for count in range(args.runs)]
+            wall = statistics.median(wall for wall, total, toplevel in runs)
+            imports = statistics.median(
+                total for wall, total, toplevel in runs
+            )
+            print(
+                "{:<14} {:8.1f} ms wall  {:8.1f} ms importing".format(
+                    name, wall * 1000, imports / 1000
+                )
+            )
+            toplevel = runs[-1][2]
+            slowest = sorted(toplevel, key=toplevel.get, reverse=True)
+            for module in slowest[: args.top]:
+                print(
+                    "    {:<30} {:8.1f} ms".format(
+                        module, toplevel[module] / 1000
+                    )
+                )
+            if args.budget is not None and wall * 1000 > args.budget:
+                overbudget = True
+                print(
+                    "    over the budget of {:.1f} ms".format(args.budget)
+                )
+    if overbudget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
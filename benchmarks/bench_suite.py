@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Time each phase of an xjs run over synthetic juju 1 and juju 2 status files
+of growing sizes and write the results to JSON, run from the top of the
+repository:
+
+    python3 benchmarks/bench_suite.py [--sizes N ...] [--memory]
+        [--results FILE] [--compare FILE]
+
+The phases are reading the file, parsing it, loading the model, loading it
+with a status filter, looking up charm revisions from a local stub charm
+store and rendering every table.  With --memory the peak and retained memory
+of each phase are measured in a separate run with tracemalloc.  With
+--compare the exit status is 1 if a phase got slower or used more memory than
+the threshold compared to an earlier results file
+"""
+
+import argparse
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import io
+import json
+import os
+import platform
+from socketserver import ThreadingMixIn
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+from common import load_xjs
+from charmstore import RevisionFetcher
+from filters import StatusFilter
+from generate_status import generate_status
+from outputs import TableOutput
+from profiling import Profiler
+from xjsversion import __version__
+
+default_sizes = [10, 100, 1000, 10000, 100000]
+phases = ("read", "parse", "load", "filter", "lookup", "render")
+# Each measure compared between runs and the least change that can count
+# as a regression, smaller changes are noise
+metrics = (
+    ("seconds", 0.01),
+    ("peak_bytes", 256 * 1024),
+    ("retained_bytes", 256 * 1024),
+)
+
+
+class StubCharmStore(ThreadingMixIn, HTTPServer):
+    """A charm store answering every charm id with the same revision"""
+
+    daemon_threads = True
+
+
+class StubCharmStoreHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        charmids = parse_qs(urlparse(self.path).query).get("id", [])
+        body = json.dumps(
+            {charmid: {"Revision": 100} for charmid in charmids}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_charmstore():
+    """Start a stub charm store in a thread and return its URL"""
+    server = StubCharmStore(("127.0.0.1", 0), StubCharmStoreHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return "http://127.0.0.1:{}/v4".format(server.server_address[1])
+
+
+def render(xjs):
+    """Render every table the way xjs shows them by default"""
+    output = TableOutput(io.StringIO())
+    xjs.console_print_model_info(True, output=output)
+    xjs.console_print_application_info(True, output=output)
+    xjs.console_print_unit_info(True, output=output)
+    xjs.console_print_machine_info(True, output=output)
+    xjs.console_print_networkinterface_info(True, output=output)
+    xjs.console_print_relations(True, output=output)
+
+
+def run_once(xjs, path, charmstoreurl, profiler):
+    """Run every phase once on a status file, timed by the profiler"""
+    with profiler.phase("read"):
+        with open(path) as statusfile:
+            text = statusfile.read()
+
+    with profiler.phase("parse"):
+        rawstatus = xjs.parse_status(text)
+
+    xjs.controllers.clear()
+    with profiler.phase("filter"):
+        status_filter = StatusFilter(application="app-1")
+        xjs.add_model(xjs.build_model(rawstatus, status_filter))
+        xjs.filter_results(status_filter)
+
+    xjs.controllers.clear()
+    with profiler.phase("load"):
+        model = xjs.build_model(rawstatus)
+        xjs.add_model(model)
+
+    with profiler.phase("lookup"):
+        fetcher = RevisionFetcher(charmstoreurl)
+        fetcher.add_model(model)
+        revisions = fetcher.get_revisions()
+        for controller in xjs.controllers.values():
+            controller.update_app_version_info(revisions)
+
+    with profiler.phase("render"):
+        render(xjs)
+    profiler.disable()
+    return profiler
+
+
+def compare(results, previous, threshold):
+    """
+    Print how each phase compares to a previous run and return the number of
+    phases which got slower or used more memory by more than the threshold
+    """
+    before = {
+        (result["juju"], result["units"], result["phase"]): result
+        for result in previous["results"]
+    }
+    regressions = 0
+    for result in results:
+        key = (result["juju"], result["units"], result["phase"])
+        for metric, minimum in metrics:
+            # Memory released by a phase makes its retained memory negative
+            if metric not in result or before.get(key, {}).get(metric, 0) <= 0:
+                continue
+            value = result[metric]
+            beforevalue = before[key][metric]
+            ratio = value / beforevalue
+            flag = ""
+            if ratio > threshold and value - beforevalue > minimum:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(
+                "juju {} {:>7} units {:<7} {:<14} {:6.2f}x{}".format(
+                    result["juju"],
+                    result["units"],
+                    result["phase"],
+                    metric,
+                    ratio,
+                    flag,
+                )
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=default_sizes
+    )
+    parser.add_argument("--juju", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--results", help="Write the results to this file")
+    parser.add_argument("--compare", help="Compare with this results file")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Also measure the peak and retained memory of each phase",
+    )
+    args = parser.parse_args()
+
+    xjs = load_xjs()
+    charmstoreurl = start_charmstore()
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for juju in args.juju:
+            for units in args.sizes:
+                path = os.path.join(tmpdir, "status.json")
+                with open(path, "w") as statusfile:
+                    json.dump(generate_status(units, juju), statusfile)
+                runs = []
+                for count in range(args.repeat):
+                    profiler = Profiler()
+                    profiler.enable()
+                    runs.append(run_once(xjs, path, charmstoreurl, profiler))
+                # Tracing memory slows everything down, it gets a run of
+                # its own
+                memory = None
+                if args.memory:
+                    memory = Profiler()
+                    memory.enable(memory=True)
+                    run_once(xjs, path, charmstoreurl, memory)
+                for phase in phases:
+                    result = {
+                        "juju": juju,
+                        "units": units,
+                        "phase": phase,
+                        "seconds": min(run.wall[phase] for run in runs),
+                    }
+                    if memory is not None:
+                        result["peak_bytes"] = memory.peak[phase]
+                        result["retained_bytes"] = memory.retained[phase]
+                    results.append(result)
+                best = results[-len(phases):]
+                print(
+                    "juju {} {:>7} units  ".format(juju, units)
+                    + "  ".join(
+                        "{} {:.1f}ms".format(
+                            result["phase"], result["seconds"] * 1000
+                        )
+                        + (
+                            " {:.0f}KiB".format(result["peak_bytes"] / 1024)
+                            if "peak_bytes" in result
+                            else ""
+                        )
+                        for result in best
+                    )
+                )
+
+    if args.results:
+        with open(args.results, "w") as resultsfile:
+            json.dump(
+                {
+                    "xjs": __version__,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "results": results,
+                },
+                resultsfile,
+                indent=1,
+            )
+            resultsfile.write("\n")
+
+    if args.compare:
+        with open(args.compare) as previousfile:
+            previous = json.load(previousfile)
+        if compare(results, previous, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
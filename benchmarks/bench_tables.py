@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Time rendering the unit and network interface tables of large status files
+with the table writer, and with PrettyTable when it is installed, run from
+the top of the repository:
+
+    python3 benchmarks/bench_tables.py [--copies N] [status files]
+"""
+
+import argparse
+import io
+import timeit
+from common import load_xjs
+from columns import get_columns
+from tables import write_table
+
+try:
+    from prettytable import PrettyTable
+except ImportError:
+    PrettyTable = None
+
+default_files = [
+    "examples/example1.json",
+    "examples/example3.yaml",
+    "examples/example6.json",
+]
+
+
+def prettytable_string(column_names, rows):
+    """Render a table the way xjs did before the table writer"""
+    table = PrettyTable()
+    table.field_names = column_names
+    for row in rows:
+        table.add_row(list(row))
+    table.align = "l"
+    return str(table) + "\n"
+
+
+def get_rows(table, entities):
+    """Return the column names and colored rows of a table"""
+    columns, hidden = get_columns(table)
+    rows = [
+        [column.color(entity) for column in columns] for entity in entities
+    ]
+    return [column.name for column in columns], rows
+
+
+def get_tables(xjs, copies):
+    """Return the unit and network interface tables of every model"""
+    units = []
+    nics = []
+    for controller in xjs.controllers.values():
+        for model in controller.models.values():
+            for application in model.applications.values():
+                for unit in application.units.values():
+                    units.append(unit)
+                    for subunit in unit.subordinates.values():
+                        units.append(subunit)
+            for machine in list(model.machines.values()) + list(
+                model.containers.values()
+            ):
+                for nic in machine.networkinterfaces.values():
+                    nics.append(nic)
+    return (
+        ("units",) + get_rows("units", units * copies),
+        ("nics",) + get_rows("net", nics * copies),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=50)
+    parser.add_argument("statusfiles", nargs="*", default=default_files)
+    args = parser.parse_args()
+
+    xjs = load_xjs()
+    for filename in args.statusfiles:
+        with open(filename) as statusfile:
+            text = statusfile.read()
+        model = xjs.build_model(xjs.parse_status(text, name=filename))
+        model.controller.name = filename
+        xjs.add_model(model)
+
+    for name, column_names, rows in get_tables(xjs, args.copies):
+        out = io.StringIO()
+        write_table(column_names, rows, out)
+        if PrettyTable is not None:
+            assert out.getvalue() == prettytable_string(column_names, rows)
+
+        runs = [
+            (
+                "table writer",
+                lambda: write_table(column_names, rows, io.StringIO()),
+            )
+        ]
+        if PrettyTable is not None:
+            runs.append(
+                ("prettytable", lambda: prettytable_string(column_names, rows))
+            )
+        for runname, func in runs:
+            best = min(timeit.repeat(func, number=1, repeat=3))
+            print(
+                "{:<6} {:>7} rows  {:<13} {:8.1f} ms".format(
+                    name, len(rows), runname, best * 1000
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
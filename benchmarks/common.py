@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Helpers shared by the benchmarks"""
+
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+topdir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if topdir not in sys.path:
+    sys.path.insert(0, topdir)
+
+
+def load_xjs():
+    """
+    Import the xjs script as a module so the benchmarks can call its loading
+    and printing functions directly
+    """
+    loader = importlib.machinery.SourceFileLoader(
+        "xjs", os.path.join(topdir, "xjs")
+    )
+    spec = importlib.util.spec_from_loader("xjs", loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+class StatusFile:
+    """The parts of a click file object the xjs loaders use"""
+
+    def __init__(self, name, text=None):
+        self.name = name
+        self.text = text
+
+    def read(self):
+        if self.text is None:
+            with open(self.name) as statusfile:
+                return statusfile.read()
+        return self.text
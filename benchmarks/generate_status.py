@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Generate synthetic juju status files of any size in the juju 1 or juju 2
+format, run from the top of the repository:
+
+    python3 benchmarks/generate_status.py [--units N] [--juju 1|2] [file]
+
+Every principal unit gets a subordinate unit, a third of them are in
+containers, machines have two network interfaces and containers one, and
+every application is related to the next one
+"""
+
+import argparse
+import json
+import random
+import sys
+
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep")
+SERIES = ("xenial", "bionic")
+UNITS_PER_APPLICATION = 10
+UNITS_PER_MACHINE = 2
+APPLICATIONS_PER_SUBORDINATE = 5
+CONTAINER_EVERY = 3
+
+
+def make_date(rand):
+    return "{:02d} {} 2019 {:02d}:{:02d}:{:02d}Z".format(
+        rand.randint(1, 28),
+        rand.choice(MONTHS),
+        rand.randint(0, 23),
+        rand.randint(0, 59),
+        rand.randint(0, 59),
+    )
+
+
+def make_status(rand, current, message=None):
+    status = {"current": current, "since": make_date(rand)}
+    if message:
+        status["message"] = message
+    return status
+
+
+def make_address(number):
+    return "10.{}.{}.{}".format(
+        (number >> 16) & 255, (number >> 8) & 255, number & 255
+    )
+
+
+def make_interfaces(rand, number, count):
+    interfaces = {}
+    for index in range(count):
+        interfaces["eth{}".format(index)] = {
+            "ip-addresses": [make_address(number * 4 + index)],
+            "mac-address": ":".join(
+                "{:02x}".format(rand.randint(0, 255)) for byte in range(6)
+            ),
+            "gateway": make_address(1),
+            "space": "space-{}".format(index),
+            "is-up": True,
+        }
+    return interfaces
+
+
+def make_machine(rand, juju, number, name, container=False):
+    """Return the status of a machine or container"""
+    machine = {
+        "dns-name": make_address(number),
+        "ip-addresses": [make_address(number)],
+        "instance-id": "juju-{:06x}-{}".format(number, name.replace("/", "-")),
+        "series": rand.choice(SERIES),
+        "network-interfaces": make_interfaces(
+            rand, number, 1 if container else 2
+        ),
+    }
+    if juju == 1:
+        machine["agent-state"] = "started"
+        machine["agent-version"] = "1.25.6"
+    else:
+        machine["juju-status"] = make_status(rand, "started")
+        machine["juju-status"]["version"] = "2.6.8"
+        machine["machine-status"] = make_status(
+            rand, "running", "Container started" if container else "Deployed"
+        )
+    if not container:
+        machine["hardware"] = (
+            "arch=amd64 cores={} mem={}M availability-zone=zone{}".format(
+                rand.choice((4, 8, 16)),
+                rand.choice((8192, 16384, 65536)),
+                number % 3,
+            )
+        )
+    return machine
+
+
+def make_unit(rand, juju, machinename, number, subordinate=False):
+    """Return the status of a unit or subordinate unit"""
+    statuskey = "agent-status" if juju == 1 else "juju-status"
+    workload = rand.choice(("active",) * 8 + ("blocked", "maintenance"))
+    unit = {
+        "workload-status": make_status(rand, workload, "Unit is ready"),
+        statuskey: make_status(rand, "idle"),
+        "public-address": make_address(number),
+    }
+    if juju == 1:
+        unit["agent-state"] = "started"
+        unit["agent-version"] = "1.25.6"
+    if subordinate:
+        unit["upgrading-from"] = ""
+    else:
+        unit["machine"] = machinename
+        unit["open-ports"] = ["{}/tcp".format(8000 + number % 100)]
+    return unit
+
+
+def make_application(rand, juju, name, series):
+    revision = rand.randint(1, 500)
+    application = {
+        "charm": "cs:{}/{}-{}".format(series, name, revision),
+        "series": series,
+        "exposed": False,
+        "relations": {},
+    }
+    statuskey = "service-status" if juju == 1 else "application-status"
+    application[statuskey] = make_status(rand, "active", "Unit is ready")
+    if juju == 2:
+        application["os"] = "ubuntu"
+        application["charm-origin"] = "jujucharms"
+        application["charm-name"] = name
+        application["charm-rev"] = revision
+        application["version"] = "1.0.{}".format(revision)
+    return application
+
+
+def generate_status(units, juju=2, seed=0):
+    """
+    Return a juju status dictionary with the given number of principal units
+    """
+    rand = random.Random(seed)
+    applicationcount = max(1, -(-units // UNITS_PER_APPLICATION))
+    subordinatecount = max(1, applicationcount // APPLICATIONS_PER_SUBORDINATE)
+
+    machines = {}
+    applications = {}
+    principals = ["app-{}".format(index) for index in range(applicationcount)]
+    subordinates = [
+        "sub-{}".format(index) for index in range(subordinatecount)
+    ]
+    for name in principals:
+        applications[name] = make_application(
+            rand, juju, name, rand.choice(SERIES)
+        )
+        applications[name]["units"] = {}
+    for name in subordinates:
+        applications[name] = make_application(rand, juju, name, SERIES[0])
+        applications[name]["subordinate-to"] = []
+
+    addresses = 0
+    containers = {}
+    for number in range(units):
+        # Spread the units over the applications and the machines, some of
+        # them in containers
+        appname = principals[number % applicationcount]
+        machinenumber = number // UNITS_PER_MACHINE
+        machinename = str(machinenumber)
+        if machinename not in machines:
+            addresses += 1
+            machines[machinename] = make_machine(
+                rand, juju, addresses, machinename
+            )
+        if number % CONTAINER_EVERY == CONTAINER_EVERY - 1:
+            containernumber = containers.get(machinename, 0)
+            containers[machinename] = containernumber + 1
+            containername = "{}/lxd/{}".format(machinename, containernumber)
+            addresses += 1
+            machines[machinename].setdefault("containers", {})[
+                containername
+            ] = make_machine(rand, juju, addresses, containername, True)
+            machinename = containername
+
+        unitname = "{}/{}".format(appname, number // applicationcount)
+        unit = make_unit(rand, juju, machinename, addresses)
+        if number // applicationcount == 0:
+            unit["leader"] = True
+        subname = subordinates[number % subordinatecount]
+        subunitname = "{}/{}".format(subname, number // subordinatecount)
+        unit["subordinates"] = {
+            subunitname: make_unit(rand, juju, machinename, addresses, True)
+        }
+        if appname not in applications[subname]["subordinate-to"]:
+            applications[subname]["subordinate-to"].append(appname)
+            applications[subname]["relations"]["juju-info"] = applications[
+                subname
+            ]["subordinate-to"]
+            applications[appname]["relations"]["juju-info"] = [subname]
+        applications[appname]["units"][unitname] = unit
+
+    # Relate each application to the next one
+    for index, name in enumerate(principals[:-1]):
+        partner = principals[index + 1]
+        applications[name]["relations"]["db"] = [partner]
+        applications[partner]["relations"]["db"] = [name]
+
+    status = {"machines": machines}
+    if juju == 1:
+        status["environment"] = "synthetic"
+        status["environment-status"] = {"name": "synthetic"}
+        status["services"] = applications
+    else:
+        status["model"] = {
+            "name": "synthetic",
+            "type": "iaas",
+            "controller": "synthetic-controller",
+            "cloud": "synthetic-cloud",
+            "version": "2.6.8",
+            "model-status": make_status(rand, "available"),
+            "sla": "unsupported",
+        }
+        status["applications"] = applications
+        status["controller"] = {"timestamp": "12:00:00Z"}
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--units", type=int, default=1000)
+    parser.add_argument("--juju", type=int, choices=(1, 2), default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--yaml", action="store_true")
+    parser.add_argument("statusfile", nargs="?")
+    args = parser.parse_args()
+
+    status = generate_status(args.units, args.juju, args.seed)
+    out = open(args.statusfile, "w") if args.statusfile else sys.stdout
+    try:
+        if args.yaml:
+            import yaml
+
+            yaml.safe_dump(status, out, default_flow_style=False)
+        else:
+            json.dump(status, out, indent=1)
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import sys
+import threading
+from urllib.parse import quote
+
+# requests and the thread pool are imported when the charm store is first
+# asked for anything, runs which never query it start noticeably faster
+# without them
+
+CHARMSTORE_URL = "https://api.jujucharms.com/v4"
+# Servers and proxies commonly refuse URLs much longer than this
+MAX_URL_LENGTH = 2000
+# Seconds to wait for a connection and then for each read of a response
+CHARMSTORE_TIMEOUT = (3.05, 10)
+CHARMSTORE_WORKERS = 4
+
+
+def get_charm_ids(model):
+    """Return the charm store ids of the applications of a model"""
+    charmids = set()
+    for application in model.applications.values():
+        if application.charmorigin == "jujucharms" and application.charmid:
+            charmids.add(application.charmid)
+    return sorted(charmids)
+
+
+def get_batch_urls(charmids, baseurl=CHARMSTORE_URL, maxlength=MAX_URL_LENGTH):
+    """
+    Return the URLs asking for the metadata of the charm ids, with as many
+    ids in each as fit in maxlength.  An id too long to share a URL gets one
+    of its own
+    """
+    prefix = baseurl.rstrip("/") + "/meta/id?"
+    urls = []
+    url = prefix
+    for charmid in charmids:
+        query = "id=" + quote(charmid, safe=":/~")
+        if url != prefix and len(url) + 1 + len(query) > maxlength:
+            urls.append(url)
+            url = prefix
+        if url != prefix:
+            url += "&"
+        url += query
+    if url != prefix:
+        urls.append(url)
+    return urls
+
+
+def fetch_batch(session, url, timeout=CHARMSTORE_TIMEOUT):
+    """
+    Return the charm metadata for one URL, raises a ValueError if the answer
+    isn't a JSON object of charm ids
+    """
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+    if not isinstance(data, dict):
+        raise ValueError("Unexpected charm store response from " + url)
+    return data
+
+
+def fetch_revisions(
+    charmids,
+    baseurl=CHARMSTORE_URL,
+    timeout=CHARMSTORE_TIMEOUT,
+    workers=CHARMSTORE_WORKERS,
+):
+    """
+    Return a dictionary of the latest revision of each charm id in the charm
+    store.  The ids are asked for in batches fetched concurrently over one
+    pooled session, ids in batches which fail are left out
+    """
+    revisions = {}
+    urls = get_batch_urls(charmids, baseurl)
+    if not urls:
+        return revisions
+
+    from concurrent.futures import ThreadPoolExecutor
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    workers = min(workers, len(urls))
+    failures = 0
+    with requests.Session() as session:
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=workers
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(fetch_batch, session, url, timeout)
+                for url in urls
+            ]
+            for future in futures:
+                try:
+                    data = future.result()
+                except (requests.RequestException, ValueError):
+                    failures += 1
+                    continue
+                for charmid, meta in data.items():
+                    if isinstance(meta, dict) and "Revision" in meta:
+                        revisions[charmid] = meta["Revision"]
+
+    if failures:
+        print(
+            "WARNING: Unable to reach the charm store at {} for {} of {} "
+            "requests".format(baseurl, failures, len(urls)),
+            file=sys.stderr,
+        )
+    return revisions
+
+
+def get_revisions(
+    charmids, baseurl=CHARMSTORE_URL, cache=None, ttl=None, cachedonly=False
+):
+    """
+    Return a dictionary of the latest revision of each charm id, taken from
+    the cache when it was fetched within ttl seconds and from the charm
+    store otherwise.  With cachedonly every cached revision is used however
+    old it is and the charm store is never asked
+    """
+    revisions = {}
+    if cache is not None:
+        revisions = cache.load(baseurl, charmids, None if cachedonly else ttl)
+    missing = [charmid for charmid in charmids if charmid not in revisions]
+    if missing and not cachedonly:
+        fetched = fetch_revisions(missing, baseurl)
+        if cache is not None and fetched:
+            cache.store(baseurl, fetched)
+        revisions.update(fetched)
+    return revisions
+
+
+class RevisionFetcher:
+    """
+    Look up charm revisions in a background thread as models are loaded, so
+    the charm store is queried while xjs carries on parsing and rendering
+    """
+
+    def __init__(
+        self, baseurl=CHARMSTORE_URL, cache=None, ttl=None, cachedonly=False
+    ):
+        self.baseurl = baseurl
+        self.cache = cache
+        self.ttl = ttl
+        self.cachedonly = cachedonly
+        self.requested = set()
+        # Every model added, their applications are the ones to update
+        self.models = []
+        self.pending = []
+        self.lock = threading.Lock()
+        self.futures = []
+        self.executor = None
+
+    def add_model(self, model):
+        """Queue up the charms of a model which haven't been asked for yet"""
+        self.models.append(model)
+        charmids = [
+            charmid
+            for charmid in get_charm_ids(model)
+            if charmid not in self.requested
+        ]
+        if not charmids:
+            return
+        self.requested.update(charmids)
+        with self.lock:
+            self.pending.extend(charmids)
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        self.futures.append(self.executor.submit(self.fetch_pending))
+
+    def fetch_pending(self):
+        """
+        Fetch every charm queued so far, models added while a fetch is in
+        flight are gathered into the next one
+        """
+        with self.lock:
+            charmids = self.pending
+            self.pending = []
+        if not charmids:
+            return {}
+        return get_revisions(
+            charmids, self.baseurl, self.cache, self.ttl, self.cachedonly
+        )
+
+    def done(self):
+        """Return True once every queued fetch has finished"""
+        return all(future.done() for future in self.futures)
+
+    def get_revisions(self):
+        """Wait for every queued fetch and return all the revisions found"""
+        revisions = {}
+        for future in self.futures:
+            revisions.update(future.result())
+        if self.executor is not None:
+            self.executor.shutdown()
+        return revisions
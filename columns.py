@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from collections import namedtuple
+from operator import attrgetter, methodcaller
+from types import MappingProxyType
+
+# A column has a name, a function returning the plain text of its cell for
+# an entity, one returning the colored text and one returning the value
+# written to machine readable outputs
+Column = namedtuple("Column", ("name", "value", "color", "record"))
+
+# A table has its columns and a function returning the model of an entity,
+# used for the controller and model columns when several are shown
+Table = namedtuple("Table", ("columns", "get_model"))
+
+
+def make_column(name, value, color=None, record=None):
+    """
+    Return a column whose color and record functions default to its value
+    function
+    """
+    return Column(name, value, color or value, record or value)
+
+
+def join_notes(entity):
+    return ", ".join(entity.notes)
+
+
+def get_unit_model(unit):
+    if unit.issubordinate:
+        return unit.unit.application.model
+    return unit.application.model
+
+
+def get_unit_name(unit):
+    """Subordinate units are indented and leaders are marked with a *"""
+    name = unit.name
+    if unit.issubordinate:
+        name = "  " + name
+    if unit.leader:
+        name += "*"
+    return name
+
+
+def get_unit_machine(unit):
+    if unit.issubordinate:
+        return ""
+    if unit.machine:
+        return unit.machine.name
+    return "PENDING"
+
+
+def make_hardware_column(name, key):
+    """Containers have no hardware of their own"""
+
+    def get_hardware(machine):
+        if machine.iscontainer:
+            return ""
+        return machine.hardware[key]
+
+    return make_column(name, get_hardware)
+
+
+def get_machine_message_color(machine):
+    if machine.iscontainer:
+        return machine.get_machinemessage_color()
+    return machine.machinemessage
+
+
+def get_relation_application(relation):
+    return relation.application.name + ":" + relation.name
+
+
+def get_relation_partner(relation):
+    return relation.partner.name + ":" + relation.name
+
+
+# Tables of entities within models can also show which controller and model
+# each row belongs to
+CONTROLLER_COLUMN = "Controller"
+MODEL_COLUMN = "Model"
+
+# The tables are named after the option showing them
+TABLES = MappingProxyType(
+    {
+        "model": Table(
+            (
+                make_column("Model", attrgetter("name")),
+                make_column("Controller", attrgetter("controller.name")),
+                make_column("Cloud/Region", attrgetter("cloud")),
+                make_column(
+                    "Version",
+                    attrgetter("version"),
+                    methodcaller("get_version_color"),
+                ),
+                make_column("SLA", attrgetter("sla")),
+                make_column(
+                    "Timestamp", methodcaller("get_timestamp_string")
+                ),
+                make_column(
+                    "Model-Status",
+                    attrgetter("modelstatus"),
+                    methodcaller("get_modelstatus_color"),
+                ),
+                make_column(
+                    "Meter-Status",
+                    attrgetter("meterstatus"),
+                    methodcaller("get_meterstatus_color"),
+                ),
+                make_column("Message", attrgetter("message")),
+                make_column(
+                    "Notes",
+                    methodcaller("get_notes", False),
+                    methodcaller("get_notes", True),
+                ),
+            ),
+            None,
+        ),
+        "apps": Table(
+            (
+                make_column("App", attrgetter("name")),
+                make_column("Version", attrgetter("version")),
+                make_column(
+                    "Status",
+                    attrgetter("status"),
+                    methodcaller("get_status_color"),
+                ),
+                make_column(
+                    "Scale",
+                    lambda application: str(application.get_scale()),
+                    methodcaller("get_scale_color"),
+                ),
+                make_column("Charm", attrgetter("charm")),
+                make_column(
+                    "Store",
+                    attrgetter("charmorigin"),
+                    methodcaller("get_charmorigin_color"),
+                ),
+                make_column(
+                    "Rev",
+                    lambda application: str(application.charmrev),
+                    methodcaller("get_charmrev_color"),
+                ),
+                make_column("OS", attrgetter("os")),
+                make_column("Series", attrgetter("series")),
+                make_column("Message", attrgetter("message")),
+                make_column("Notes", join_notes),
+            ),
+            attrgetter("model"),
+        ),
+        "units": Table(
+            (
+                make_column("Unit", get_unit_name, record=attrgetter("name")),
+                make_column(
+                    "Workload",
+                    attrgetter("workloadstatus"),
+                    methodcaller("get_workloadstatus_color"),
+                ),
+                make_column(
+                    "Agent",
+                    attrgetter("jujustatus"),
+                    methodcaller("get_jujustatus_color"),
+                ),
+                make_column("Machine", get_unit_machine),
+                make_column("Public address", attrgetter("publicaddress")),
+                make_column("Ports", lambda unit: ",".join(unit.openports)),
+                make_column("Message", attrgetter("message")),
+                make_column("Notes", join_notes),
+            ),
+            get_unit_model,
+        ),
+        "machines": Table(
+            (
+                make_column("Machine", attrgetter("name")),
+                make_column(
+                    "Agent",
+                    attrgetter("jujustatus"),
+                    methodcaller("get_jujustatus_color"),
+                ),
+                make_column(
+                    "Status",
+                    attrgetter("machinestatus"),
+                    methodcaller("get_machinestatus_color"),
+                ),
+                make_column("DNS", attrgetter("dnsname")),
+                make_column("Inst id", attrgetter("instanceid")),
+                make_column("Series", attrgetter("series")),
+                make_hardware_column("AZ", "availability-zone"),
+                make_hardware_column("Arch", "arch"),
+                make_hardware_column("Cores", "cores"),
+                make_hardware_column("Memory", "mem"),
+                make_column(
+                    "Message",
+                    attrgetter("machinemessage"),
+                    get_machine_message_color,
+                ),
+                make_column("Notes", join_notes),
+            ),
+            attrgetter("model"),
+        ),
+        "net": Table(
+            (
+                make_column("Machine", attrgetter("parent.name")),
+                make_column("Interface", attrgetter("name")),
+                make_column("IP", lambda nic: ",".join(nic.ipaddresses)),
+                make_column("MAC", attrgetter("macaddress")),
+                make_column("Gateway", attrgetter("gateway")),
+                make_column("Space", attrgetter("space")),
+                make_column(
+                    "Up",
+                    lambda nic: str(nic.up),
+                    methodcaller("get_isup_color"),
+                    attrgetter("up"),
+                ),
+                make_column("Notes", join_notes),
+            ),
+            attrgetter("model"),
+        ),
+        "relations": Table(
+            (
+                make_column("Application A", get_relation_application),
+                make_column("Application B", get_relation_partner),
+            ),
+            attrgetter("application.model"),
+        ),
+    }
+)
+
+
+# Columns only written to machine readable outputs unless asked for, the
+# tables show them another way such as leader units marked with a *
+RECORD_COLUMNS = MappingProxyType(
+    {
+        "units": (
+            make_column(
+                "Leader",
+                lambda unit: str(unit.leader),
+                record=attrgetter("leader"),
+            ),
+        ),
+    }
+)
+
+
+def normalize_column(name):
+    """Column names are matched ignoring case, spaces and underscores"""
+    return name.strip().lower().replace(" ", "-").replace("_", "-")
+
+
+def get_column_names(table):
+    """
+    Return every column name a table can have, including the controller and
+    model columns shown when there are several of them
+    """
+    columns = TABLES[table].columns + RECORD_COLUMNS.get(table, ())
+    names = [column.name for column in columns]
+    if TABLES[table].get_model is not None:
+        names = [CONTROLLER_COLUMN, MODEL_COLUMN] + names
+    return names
+
+
+def split_table_option(option):
+    """
+    Split an option value of the form [table:]column[,column...] into the
+    table, or None for every table, and the column names.  Raises a
+    ValueError for an unknown table
+    """
+    table = None
+    columns = option
+    if ":" in option:
+        table, columns = option.split(":", 1)
+        table = table.strip().lower()
+        if table not in TABLES:
+            raise ValueError(
+                "Unknown table {}, use one of {}".format(
+                    table, ", ".join(TABLES)
+                )
+            )
+    names = [name.strip() for name in columns.split(",") if name.strip()]
+    return table, names
+
+
+def check_columns(table, names):
+    """Raise a ValueError if a table, or every table, has no such column"""
+    if table is None:
+        known = [name for each in TABLES for name in get_column_names(each)]
+    else:
+        known = get_column_names(table)
+    known = {normalize_column(name) for name in known}
+    for name in names:
+        if normalize_column(name) not in known:
+            raise ValueError("Unknown column {}".format(name))
+
+
+def parse_column_options(columnoptions):
+    """
+    Parse --columns values into a dictionary of the normalized column names
+    to show in each table, tables which aren't in it show every column
+    """
+    shown = {}
+    for option in columnoptions:
+        table, names = split_table_option(option)
+        check_columns(table, names)
+        names = [normalize_column(name) for name in names]
+        for tablename in TABLES if table is None else (table,):
+            tablenames = [
+                normalize_column(name) for name in get_column_names(tablename)
+            ]
+            selected = [name for name in names if name in tablenames]
+            if selected:
+                shown.setdefault(tablename, []).extend(selected)
+    return shown
+
+
+def make_context_columns(get_model):
+    """Return the controller and model columns of a table"""
+    return (
+        make_column(
+            CONTROLLER_COLUMN,
+            lambda entity: get_model(entity).controller.name,
+        ),
+        make_column(MODEL_COLUMN, lambda entity: get_model(entity).name),
+    )
+
+
+def get_columns(
+    table,
+    include_controller_name=False,
+    include_model_name=False,
+    shown=None,
+    extra=(),
+    records=False,
+):
+    """
+    Return the columns of a table and how many at the end of them are
+    hidden.  When shown lists normalized column names only those are shown,
+    in that order, otherwise the controller and model columns are included
+    as asked, and the record columns for machine readable outputs when
+    records is True.  Any normalized names in extra, such as columns to sort
+    by, are appended as hidden columns if they are not shown
+    """
+    get_model = TABLES[table].get_model
+    recordcolumns = RECORD_COLUMNS.get(table, ())
+    columns = TABLES[table].columns
+    if get_model is not None:
+        context = make_context_columns(get_model)
+        if shown is None:
+            columns = (
+                context[:1] * include_controller_name
+                + context[1:] * include_model_name
+                + columns
+            )
+        else:
+            columns = context + columns
+
+    allcolumns = columns + recordcolumns
+    if shown is None:
+        selected = list(allcolumns if records else columns)
+    else:
+        bynames = {
+            normalize_column(column.name): column for column in allcolumns
+        }
+        selected = [bynames[name] for name in shown if name in bynames]
+    names = {normalize_column(column.name) for column in selected}
+    hidden = 0
+    for column in allcolumns:
+        name = normalize_column(column.name)
+        if name in extra and name not in names:
+            selected.append(column)
+            names.add(name)
+            hidden += 1
+    return selected, hidden
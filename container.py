@@ -19,6 +19,7 @@ from colors import Color
 
 
 class Container(BasicMachine):
+    __slots__ = ("machine",)
     iscontainer = True
 
     def __init__(self, containername, containerinfo, machine, model):
@@ -40,47 +41,3 @@ class Container(BasicMachine):
             return Color.Fg.Green + self.machinemessage + Color.Reset
         else:
             return Color.Fg.Yellow + self.machinemessage + Color.Reset
-
-    def get_row(
-        self, color, include_controller_name=False, include_model_name=False
-    ):
-        """Return a list which can be used for a row in a table."""
-        row = []
-        notesstr = ", ".join(self.notes)
-
-        if color:
-            row = [
-                self.name,
-                self.get_jujustatus_color(),
-                self.get_machinestatus_color(),
-                self.dnsname,
-                self.instanceid,
-                self.series,
-                "",
-                "",
-                "",
-                "",
-                self.get_machinemessage_color(),
-                notesstr,
-            ]
-        else:
-            row = [
-                self.name,
-                self.jujustatus,
-                self.machinestatus,
-                self.dnsname,
-                self.instanceid,
-                self.series,
-                "",
-                "",
-                "",
-                "",
-                self.machinemessage,
-                notesstr,
-            ]
-
-        if include_model_name:
-            row.insert(0, self.machine.model.name)
-        if include_controller_name:
-            row.insert(0, self.machine.model.controller.name)
-        return row
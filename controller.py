@@ -15,13 +15,12 @@
 # this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
-import re
-import pendulum
-import requests
+import copy
+from dates import parse_timestamp, zerodate
 
 
 class Controller:
-    zerodate = pendulum.from_format("0", "x", tz="UTC")
+    zerodate = zerodate
 
     def __init__(self, controllername, controllerinfo={}):
         """
@@ -35,36 +34,54 @@ class Controller:
 
         # Required Variables
         self.timestampprovided = False
-        self.timestamp = Controller.zerodate
+        self.providedtimestamp = Controller.zerodate
+
+        # Candidate dates, the timestamp is only worked out when it is needed
+        self.latestdate = None
+        self.latestday = None
+        self.resolvedtimestamp = None
+        self.datesources = []
 
         # Calculated Values
         if "timestamp" in controllerinfo:
             self.timestampprovided = True
-            if re.match(r"^\d\d:\d\d:\d\d", controllerinfo["timestamp"]):
-                controllerinfo["timestamp"] = "01 Jan 1970 " + controllerinfo["timestamp"]
-            if re.match(r".*Z$", controllerinfo["timestamp"]):
-                controllerinfo["timestamp"] = re.sub(r"Z$", "", controllerinfo["timestamp"])
-                self.timestamp = pendulum.from_format(
-                    controllerinfo["timestamp"],
-                    "DD MMM YYYY HH:mm:ss",
-                    tz="UTC",
-                )
-            elif re.match(r".*[+-]\d\d:\d\d$", controllerinfo["timestamp"]):
-                self.timestamp = pendulum.from_format(
-                    controllerinfo["timestamp"],
-                    "DD MMM YYYY HH:mm:ssZ",
-                    tz="UTC",
-                )
-            else:
-                self.timestamp = pendulum.from_format(
-                    controllerinfo["timestamp"],
-                    "DD MMM YYYY HH:mm:ss",
-                )
-
-    def __dict__(self):
-        return {self.name: self}
-
-    def update_timestamp(self, date):
+            self.providedtimestamp = parse_timestamp(
+                controllerinfo["timestamp"]
+            )
+
+    def record_date(self, date):
+        """
+        Record a date from the juju status as a candidate for the controller
+        timestamp, only the latest date and latest calendar day are kept
+        """
+        if self.latestdate is None or date > self.latestdate:
+            self.latestdate = date
+        day = (date.year, date.month, date.day)
+        if self.latestday is None or day > self.latestday:
+            self.latestday = day
+        self.resolvedtimestamp = None
+
+    def add_date_source(self, record_dates):
+        """
+        Add a function recording dates which have not been recorded yet, such
+        as those of units which have not been created, it is only called with
+        this controller when the timestamp is needed
+        """
+        self.datesources.append(record_dates)
+        self.resolvedtimestamp = None
+
+    def merge_dates(self, controller):
+        """Record the candidate dates of another controller by the same name"""
+        self.datesources.extend(controller.datesources)
+        if controller.latestdate is not None:
+            self.record_date(controller.latestdate)
+        if controller.latestday is not None and (
+            self.latestday is None or controller.latestday > self.latestday
+        ):
+            self.latestday = controller.latestday
+
+    @property
+    def timestamp(self):
         """
         Timestamps from juju status for controllers only contain a time but all
         other timestamps in the juju status contain dates and times.  We need
@@ -72,66 +89,59 @@ class Controller:
         controller.  For some versions of juju there is no timestamp, so we
         will "guess" at a time as well.
         """
+        if self.datesources:
+            datesources, self.datesources = self.datesources, []
+            for record_dates in datesources:
+                record_dates(self)
+        if self.resolvedtimestamp is None:
+            self.resolvedtimestamp = self.resolve_timestamp()
+        return self.resolvedtimestamp
+
+    def resolve_timestamp(self):
+        """Work out the timestamp from the recorded candidate dates"""
         # if the timestamp was not provided use the latest date
         # if it was provided we only have a time but no date, we should use
-        # the latest date from any other status gathered
+        # the latest calendar day from any other status gathered
+        timestamp = self.providedtimestamp
         if self.timestampprovided:
-            # Hard Case - Get the time from the existing timestamp:
-            # Goal Format %d %b %Y %H:%M:%S%z
-            str_time = self.timestamp.format("HH:mm:ssZ")
-            # Get the date from the passed in date
-            str_date = date.format("DD MMM YYYY")
-            # create a tempdate:
-            temp_date = pendulum.from_format(
-                str_date + " " + str_time, "DD MMM YYYY HH:mm:ssZ"
-            )
-            if temp_date > self.timestamp:
-                self.timestamp = temp_date
-        else:
-            if date > self.timestamp:
-                self.timestamp = date
+            if self.latestday is not None:
+                year, month, day = self.latestday
+                guess = timestamp.replace(year=year, month=month, day=day)
+                if guess > timestamp:
+                    timestamp = guess
+        elif self.latestdate is not None and self.latestdate > timestamp:
+            timestamp = self.latestdate
+        return timestamp
 
     def add_model(self, model):
         """Add a model to a controller"""
         self.models[model.name] = model
 
-    def update_app_version_info(self):
+    def update_app_version_info(self, revisions):
         """
-        Connect to the Juju Charms API and get the latest version of charms
+        Note which applications don't use the latest revision of their charm
+        in the charm store, revisions maps charm ids to their latest revision
         """
-        url = "https://api.jujucharms.com/v4/meta/id?"
-        data = {}
-
         for modelname, model in self.models.items():
-            for appname, app in model.applications.items():
-                if app.charmorigin == "jujucharms":
-                    url += "id=" + app.charmid + "&"
-
-        response = None
-        try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-        except:
-            print("WARNING: Unable to reach jujucharms.com")
+            model.update_app_version_info(revisions)
 
-        for modelname, model in self.models.items():
-            for appname, app in model.applications.items():
-                if app.charmorigin == "jujucharms":
-                    if app.charmid in data and "Revision" in data[app.charmid]:
-                        app.charmlatestrev = data[app.charmid]["Revision"]
-                        if app.charmrev < app.charmlatestrev:
-                            app.notes.append(
-                                "Stable Rev (" + str(app.charmlatestrev) + ")"
-                            )
-                        elif app.charmrev > app.charmlatestrev:
-                            app.notes.append("Using Non-Stable Rev")
+    def copy(self):
+        """
+        Return a copy of the controller which models can be merged into and
+        filtered out of without changing this one
+        """
+        controller = copy.copy(self)
+        controller.notes = list(self.notes)
+        controller.models = dict(self.models)
+        controller.datesources = list(self.datesources)
+        return controller
 
     def filter_dictionary(self, dictionary, key_filter):
+        """Keep the items whose key matches a compiled filter"""
         return {
             key: value
             for (key, value) in dictionary.items()
-            if key_filter in key
+            if key_filter(key)
         }
 
     def filter_models(self, model_filter):
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import datetime
+from functools import lru_cache
+
+# Juju status dates look like "18 Dec 2018 12:36:40Z" or
+# "17 Dec 2018 16:28:56+01:00", most of them in a status file are duplicates
+DATE_FORMAT = "DD MMM YYYY HH:mm:ss"
+DATE_CACHE_SIZE = 8192
+MONTHS = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
+
+# pendulum is slow to import, it is only imported once a date is parsed so
+# commands such as --help don't wait for it
+zerodate = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def get_timezone(suffix):
+    """
+    Return the timezone for the part of a date following the seconds, this is
+    either empty, "Z" or an offset such as "+01:00"
+    """
+    import pendulum
+
+    if suffix in ("", "Z"):
+        return pendulum.UTC
+    if (
+        len(suffix) == 6
+        and suffix[0] in "+-"
+        and suffix[3] == ":"
+        and suffix[1:3].isdigit()
+        and suffix[4:6].isdigit()
+    ):
+        offset = int(suffix[1:3]) * 3600 + int(suffix[4:6]) * 60
+        if suffix[0] == "-":
+            offset = -offset
+        return pendulum.tz.fixed_timezone(offset)
+    return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(datestr):
+    """
+    Parse a date from a juju status output, dates are in the format
+    DD MMM YYYY HH:mm:ss followed by an optional Z or UTC offset
+    """
+    import pendulum
+
+    if (
+        len(datestr) >= 20
+        and datestr[2] == " "
+        and datestr[6] == " "
+        and datestr[11] == " "
+        and datestr[14] == ":"
+        and datestr[17] == ":"
+    ):
+        month = MONTHS.get(datestr[3:6])
+        tz = get_timezone(datestr[20:])
+        digits = (
+            datestr[0:2],
+            datestr[7:11],
+            datestr[12:14],
+            datestr[15:17],
+            datestr[18:20],
+        )
+        if month and tz and all(part.isdigit() for part in digits):
+            day, year, hour, minute, second = (int(part) for part in digits)
+            # Both timezones are fixed so there is nothing for pendulum to
+            # normalize, build the DateTime directly
+            return pendulum.DateTime(
+                year, month, day, hour, minute, second, tzinfo=tz
+            )
+
+    # Anything unusual goes through the slower but more forgiving pendulum
+    # parser
+    if datestr.endswith("Z"):
+        return pendulum.from_format(datestr[:-1], DATE_FORMAT, tz="UTC")
+    return pendulum.from_format(datestr, DATE_FORMAT + "Z")
+
+
+def parse_timestamp(timestamp):
+    """
+    Parse a controller timestamp, these usually only contain a time so they
+    are placed on 01 Jan 1970
+    """
+    if timestamp[2:3] == ":" and timestamp[5:6] == ":":
+        timestamp = "01 Jan 1970 " + timestamp
+    return parse_date(timestamp)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+# Shared empty defaults, most units and machines have no notes, ports,
+# subordinates or containers so there is no point in every one of them owning
+# an empty container of its own
+
+
+class EmptyDict(dict):
+    """
+    A read-only empty dictionary.  It pickles as a reference to EMPTY_DICT so
+    cached models still share it when they are loaded
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return "EMPTY_DICT"
+
+    def readonly(self, *args, **kwargs):
+        raise TypeError("EMPTY_DICT is read-only")
+
+    __setitem__ = __delitem__ = readonly
+    clear = pop = popitem = setdefault = update = readonly
+
+
+EMPTY_DICT = EmptyDict()
+EMPTY_LIST = ()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import fnmatch
+import re
+
+# Filters are substring matches unless they contain glob characters or start
+# with the regular expression prefix
+GLOB_CHARS = "*?["
+REGEX_PREFIX = "re:"
+
+
+def compile_filter(pattern):
+    """
+    Return a function matching a name against a filter pattern, or None for
+    an empty pattern.  Raises a ValueError for an invalid regular expression
+    """
+    if pattern == "":
+        return None
+    if pattern.startswith(REGEX_PREFIX):
+        try:
+            regex = re.compile(pattern[len(REGEX_PREFIX):])
+        except re.error as error:
+            raise ValueError(
+                "Invalid regular expression {}: {}".format(pattern, error)
+            )
+        return lambda name: regex.search(name) is not None
+    if any(char in pattern for char in GLOB_CHARS):
+        regex = re.compile(fnmatch.translate(pattern))
+        return lambda name: regex.match(name) is not None
+    return lambda name: pattern in name
+
+
+class StatusFilter:
+    def __init__(
+        self,
+        controller="",
+        model="",
+        application="",
+        unit="",
+        subordinate="",
+        machine="",
+    ):
+        """
+        Compile the filters for each level of the status, each one may be a
+        substring, a glob or a regular expression prefixed with "re:"
+        """
+        self.options = (
+            controller, model, application, unit, subordinate, machine
+        )
+        self.patterns = (controller, model, application, unit, subordinate)
+        self.controller = compile_filter(controller)
+        self.model = compile_filter(model)
+        self.application = compile_filter(application)
+        self.unit = compile_filter(unit)
+        self.subordinate = compile_filter(subordinate)
+        self.machine = compile_filter(machine)
+
+        # Models left without applications are only dropped when something
+        # filtered the applications
+        self.filtersapplications = (
+            self.application is not None
+            or self.unit is not None
+            or self.subordinate is not None
+        )
+
+    def __reduce__(self):
+        """The compiled filters can't be pickled, pickle what made them"""
+        return (StatusFilter, self.options)
+
+    def is_active(self):
+        """Return True if any filter was given"""
+        return (
+            self.controller is not None
+            or self.model is not None
+            or self.filtersapplications
+            or self.machine is not None
+        )
+
+    def get_cache_variant(self):
+        """
+        Return a string describing the filters applied while loading, models
+        built with different filters are cached separately
+        """
+        if not self.is_active():
+            return ""
+        return repr(self.patterns)
+
+    def select_model(self, controllername, modelname):
+        """
+        Return True if a model can survive the controller and model filters
+        """
+        if self.controller and not self.controller(controllername):
+            return False
+        if self.model and not self.model(modelname):
+            return False
+        return True
+
+    def select_applications(self, model, appsinfo):
+        """
+        Return the names of the applications in the raw status which can
+        survive the application level filters, or None if they all can.  The
+        raw units of every application have to be indexed by the model first
+        """
+        if not self.filtersapplications:
+            return None
+        selected = {}
+        for appname in appsinfo:
+            if self.application is None or self.application(appname):
+                selected[appname] = True
+        if self.application:
+            # Pull in the applications the subordinates are attached to
+            for appname in list(selected):
+                for parentname in model.subordinateparents.get(appname, {}):
+                    if parentname in appsinfo:
+                        selected[parentname] = True
+        if self.unit or self.subordinate:
+            for appname in list(selected):
+                if not self.select_units(appsinfo[appname].get("units", {})):
+                    del selected[appname]
+        return selected.keys()
+
+    def select_units(self, unitsinfo):
+        """
+        Return True if any of the raw units can survive the unit and
+        subordinate unit filters
+        """
+        for unitname, unitinfo in unitsinfo.items():
+            if self.unit and not self.unit(unitname):
+                continue
+            if self.subordinate is None:
+                return True
+            for subunitname in unitinfo.get("subordinates", {}):
+                if self.subordinate(subunitname):
+                    return True
+        return False
+
+    def filter_controllers(self, controllers):
+        """
+        Return the controllers matching the filters, trimming their models,
+        applications, units and machines in a single pass
+        """
+        filtered_controllers = {}
+        for controllername, controller in controllers.items():
+            if self.controller and not self.controller(controllername):
+                continue
+            if self.model:
+                controller.filter_models(self.model)
+            models = {}
+            for modelname, model in controller.models.items():
+                if self.filter_model(model):
+                    models[modelname] = model
+            controller.models = models
+            if models or (
+                self.model is None
+                and not self.filtersapplications
+                and self.machine is None
+            ):
+                filtered_controllers[controllername] = controller
+        return filtered_controllers
+
+    def filter_model(self, model):
+        """
+        Trim the applications, units and machines of a model, return False if
+        the model should be dropped
+        """
+        if self.filtersapplications:
+            if self.application:
+                model.filter_applications(self.application)
+            if self.unit or self.subordinate:
+                applications = {}
+                for appname, application in model.applications.items():
+                    if self.filter_application(application):
+                        applications[appname] = application
+                model.applications = applications
+            # The machines only need to be worked out once, after every
+            # application level filter
+            model.reset_machines()
+            if len(model.applications) == 0:
+                return False
+
+        # This has to be last as the remaining machines no longer depend on
+        # the remaining units
+        if self.machine:
+            model.filter_machines(self.machine)
+            if len(model.machines) == 0:
+                return False
+        return True
+
+    def filter_application(self, application):
+        """
+        Trim the units and subordinate units of an application, return False
+        if no units are left
+        """
+        if self.unit:
+            application.filter_units(self.unit)
+        if self.subordinate:
+            units = {}
+            for unitname, unit in application.units.items():
+                unit.filter_subordinates(self.subordinate)
+                if len(unit.subordinates) > 0:
+                    units[unitname] = unit
+            application.units = units
+        return len(application.units) > 0
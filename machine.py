@@ -16,9 +16,11 @@
 
 from basicmachine import BasicMachine
 from container import Container
+from empty import EMPTY_DICT
 
 
 class Machine(BasicMachine):
+    __slots__ = ("containers", "constraints", "hardware")
     iscontainer = False
 
     def __init__(self, machinename, machineinfo, model):
@@ -30,7 +32,7 @@ class Machine(BasicMachine):
         BasicMachine.__init__(self, machinename, machineinfo, model)
 
         # Default Values
-        self.containers = {}
+        self.containers = EMPTY_DICT
         self.constraints = ""
         self.hardware = {}
         self.hardware["arch"] = ""
@@ -54,6 +56,7 @@ class Machine(BasicMachine):
 
         # Handle Containers if any
         if "containers" in machineinfo:
+            self.containers = {}
             for containername, containerinfo in machineinfo[
                 "containers"
             ].items():
@@ -62,48 +65,3 @@ class Machine(BasicMachine):
                 )
                 model.add_container(container)
                 self.containers[container.name] = container
-
-    # TODO: Shouldn't handle color logic at this level
-    def get_row(
-        self, color, include_controller_name=False, include_model_name=False
-    ):
-        row = []
-        """Return a list which can be used for a row in a table."""
-        notesstr = ", ".join(self.notes)
-
-        if color:
-            row = [
-                self.name,
-                self.get_jujustatus_color(),
-                self.get_machinestatus_color(),
-                self.dnsname,
-                self.instanceid,
-                self.series,
-                self.hardware["availability-zone"],
-                self.hardware["arch"],
-                self.hardware["cores"],
-                self.hardware["mem"],
-                self.machinemessage,
-                notesstr,
-            ]
-        else:
-            row = [
-                self.name,
-                self.jujustatus,
-                self.machinestatus,
-                self.dnsname,
-                self.instanceid,
-                self.series,
-                self.hardware["availability-zone"],
-                self.hardware["arch"],
-                self.hardware["cores"],
-                self.hardware["mem"],
-                self.machinemessage,
-                notesstr,
-            ]
-
-        if include_model_name:
-            row.insert(0, self.model.name)
-        if include_controller_name:
-            row.insert(0, self.model.controller.name)
-        return row
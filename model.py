@@ -16,25 +16,13 @@
 
 import re
 from colors import Color
-from packaging import version
-import pendulum
+from dates import parse_date
+from relation import Relation
 
 
 class Model:
     # TODO get latest juju version dynamically
-    latest_juju_version = version.parse("2.6.8")
-    column_names = [
-        "Model",
-        "Controller",
-        "Cloud/Region",
-        "Version",
-        "SLA",
-        "Timestamp",
-        "Model-Status",
-        "Meter-Status",
-        "Message",
-        "Notes",
-    ]
+    latest_juju_version = "2.6.8"
 
     def __init__(self, modelinfo, controller, juju1env=None):
         """
@@ -44,9 +32,24 @@ class Model:
         # Default Values
         self.notes = []
         self.applications = {}
-        self.relations = {}
+        self.allapplications = {}
+        self.relationsinfo = {}
+        self._relations = None
+        self.relationindex = {}
+        self.subordinateslinked = False
         self.machines = {}
         self.containers = {}
+        self.allmachines = {}
+        self.allcontainers = {}
+
+        # Reverse indexes built from the raw status as applications are
+        # added so nothing has to walk the units later
+        self.unitmachines = {}
+        self.machineunits = {}
+        self.applicationmachines = {}
+        self.subordinateunits = {}
+        self.subordinatemachines = {}
+        self.subordinateparents = {}
         self.meterstatus = ""
         self.message = ""
         self.upgradeavailable = ""
@@ -90,18 +93,8 @@ class Model:
 
         # Required Dates
         if "model-status" in modelinfo and "since" in modelinfo["model-status"]:
-            if re.match(r".*Z$", modelinfo["model-status"]["since"]):
-                modelinfo["model-status"]["since"] = re.sub(r"Z$", "", modelinfo["model-status"]["since"])
-                self.since = pendulum.from_format(
-                    modelinfo["model-status"]["since"],
-                    "DD MMM YYYY HH:mm:ss",
-                    tz="UTC",
-                )
-            else:
-                self.since = pendulum.from_format(
-                    modelinfo["model-status"]["since"], "DD MMM YYYY HH:mm:ssZ"
-                )
-            controller.update_timestamp(self.since)
+            self.since = parse_date(modelinfo["model-status"]["since"])
+            controller.record_date(self.since)
 
         # Optional Variables
         if "meter-status" in modelinfo:
@@ -111,75 +104,230 @@ class Model:
             self.upgradeavailable = modelinfo["upgrade-available"]
             self.notes.append("upgrade available: " + self.upgradeavailable)
 
-    def __dict__(self):
-        return {self.name: self}
-
     def add_application(self, application):
         """Add an Application to this model"""
         self.applications[application.name] = application
+        self.allapplications[application.name] = application
+
+    def add_application_info(self, appname, appinfo):
+        """
+        Index the raw units and relations of an application, this is done for
+        every application in the status even if it is never created
+        """
+        self.index_units(appname, appinfo.get("units", {}))
+        if "relations" in appinfo:
+            self.relationsinfo[appname] = appinfo["relations"]
+
+    def index_units(self, appname, unitsinfo):
+        """
+        Index the units and subordinate units of an application by machine
+        and the machines by application from the raw unit information
+        """
+        appmachines = self.applicationmachines.setdefault(appname, {})
+        for unitname, unitinfo in unitsinfo.items():
+            machinename = unitinfo.get("machine")
+            if machinename is not None:
+                self.unitmachines[unitname] = machinename
+                self.machineunits.setdefault(machinename, []).append(unitname)
+                appmachines[machinename] = True
+            for subunitname in unitinfo.get("subordinates", {}):
+                subappname = re.sub(r"\/\d+$", "", subunitname)
+                self.subordinateunits.setdefault(subappname, []).append(
+                    subunitname
+                )
+                self.subordinateparents.setdefault(subappname, {})[
+                    appname
+                ] = True
+                if machinename is not None:
+                    self.unitmachines[subunitname] = machinename
+                    self.machineunits[machinename].append(subunitname)
+                    self.subordinatemachines.setdefault(subappname, {})[
+                        machinename
+                    ] = True
+
+    def get_application_machines(self, application):
+        """
+        Return the names of the machines and containers the units and
+        subordinate units of an application are on
+        """
+        unitnames = application.get_unit_names()
+        subunitnames = application.get_subordinate_names()
+        if len(unitnames) != application.unitcount or len(
+            subunitnames
+        ) != self.get_subordinate_count(application.name):
+            # Filters only ever remove units, work it out from the ones left
+            machinenames = {}
+            for unitname in list(unitnames) + list(subunitnames):
+                if unitname in self.unitmachines:
+                    machinenames[self.unitmachines[unitname]] = True
+            return machinenames
+        return {
+            **self.applicationmachines.get(application.name, {}),
+            **self.subordinatemachines.get(application.name, {}),
+        }
+
+    def get_machine_names(self, appnames):
+        """
+        Return the names of the machines and containers the units and
+        subordinate units of some applications are on from the raw indexes
+        """
+        machinenames = {}
+        for appname in appnames:
+            machinenames.update(self.applicationmachines.get(appname, {}))
+            machinenames.update(self.subordinatemachines.get(appname, {}))
+        return machinenames
+
+    @property
+    def relations(self):
+        """
+        The relations between applications in this model keyed by relation
+        name, these are only created when they are first used
+        """
+        if self._relations is None:
+            self._relations = {}
+            self.relationindex = {}
+            for appname, relationsinfo in self.relationsinfo.items():
+                for relationname, partnerapps in relationsinfo.items():
+                    for partnerapp in partnerapps:
+                        # Both ends list every relation, skip the second one
+                        # before creating an object for it
+                        if not self.get_relation(
+                            relationname, appname, partnerapp
+                        ):
+                            self.add_relation(
+                                Relation(
+                                    self, relationname, partnerapp, appname
+                                )
+                            )
+        return self._relations
+
+    @relations.setter
+    def relations(self, relations):
+        self._relations = relations
+
+    def link_subordinates(self):
+        """
+        Attach every subordinate unit to its application, there is a race
+        condition with subordinate units, they may exist before the parent
+        application does so this can only be done once all of the
+        applications exist
+        """
+        if self.subordinateslinked:
+            return
+        self.subordinateslinked = True
+        for appname, application in self.allapplications.items():
+            for unitname, unit in application.units.items():
+                for subunitname, subunit in unit.subordinates.items():
+                    subunit.create_application_relation()
+
+    def create_all(self):
+        """
+        Record every date with the controller and create every unit,
+        subordinate unit, network interface and relation which is otherwise
+        only created when it is first used.  Afterwards nothing is left to
+        parse, such as when the model is cached
+        """
+        # The dates of units have to be recorded before they are created,
+        # creating them empties the raw unit information
+        self.controller.timestamp
+        self.link_subordinates()
+        self.relations
+        for machine in self.allmachines.values():
+            machine.networkinterfaces
+        for container in self.allcontainers.values():
+            container.networkinterfaces
+
+    def get_subordinate_count(self, appname):
+        """
+        Return the number of subordinate units of an application without
+        creating any units
+        """
+        return len(self.subordinateunits.get(appname, ()))
 
     def add_machine(self, machine):
         """Add a machine to this model"""
         self.machines[machine.name] = machine
+        self.allmachines[machine.name] = machine
 
     def add_container(self, container):
         """Add a container to this model"""
         self.containers[container.name] = container
+        self.allcontainers[container.name] = container
+
+    def get_relation_key(self, name, app_name, partner_name):
+        """
+        Return the key of a relation in the relation index, the order of the
+        applications doesn't matter.  A tuple is a fraction of the size of a
+        frozenset and there is a key for every relation
+        """
+        if partner_name < app_name:
+            return (name, partner_name, app_name)
+        return (name, app_name, partner_name)
 
     def add_relation(self, relation):
+        """Add a relation if it doesn't already exist"""
         if relation is not None:
-            """Add a relation if it doesn't already exist"""
-            if not relation.name in self.relations:
-                self.relations[relation.name] = []
-                self.relations[relation.name].append(relation)
+            key = self.get_relation_key(
+                relation.name, relation.application.name, relation.partner.name
+            )
+            if key in self.relationindex:
                 return
-            else:
-                if not self.get_relation(relation.name, relation.application.name, 
-                    relation.partner.name):
-                    self.relations[relation.name].append(relation)
+            self.relationindex[key] = relation
+            if relation.name not in self.relations:
+                self.relations[relation.name] = []
+            self.relations[relation.name].append(relation)
 
     def get_relation(self, name, app_name, partner_name):
-        if name in self.relations:
-            for relation in self.relations[name]:
-                if ((relation.application.name == app_name
-                        and relation.partner.name == partner_name) or
-                        (relation.partner.name == app_name and 
-                        relation.application.name == partner_name)):
-                    return relation
-            return None
-        else:
-            return None
+        """Get a relation by name and the applications on either end"""
+        return self.relationindex.get(
+            self.get_relation_key(name, app_name, partner_name)
+        )
 
     def get_application(self, searchappname):
         """Get an Application by name"""
-        for appname, application in self.applications.items():
-            if appname == searchappname:
-                return application
-        return None
+        return self.allapplications.get(searchappname)
+
+    def update_app_version_info(self, revisions):
+        """
+        Note which applications don't use the latest revision of their charm
+        in the charm store, revisions maps charm ids to their latest revision
+        """
+        for appname, app in self.applications.items():
+            if app.charmorigin == "jujucharms":
+                if app.charmid in revisions:
+                    app.charmlatestrev = revisions[app.charmid]
+                    if app.charmrev < app.charmlatestrev:
+                        app.notes.append(
+                            "Stable Rev (" + str(app.charmlatestrev) + ")"
+                        )
+                    elif app.charmrev > app.charmlatestrev:
+                        app.notes.append("Using Non-Stable Rev")
 
     def get_machine(self, machinename):
         """Get a machine by name"""
-        if machinename in self.machines:
-            return self.machines[machinename]
-        else:
-            return None
+        return self.allmachines.get(machinename)
 
     def get_container(self, containername):
         """Get a container by name"""
-        if containername in self.containers:
-            return self.containers[containername]
-        else:
-            return None
+        return self.allcontainers.get(containername)
 
     def get_version_color(self):
         """Return a version string with correct colors based on version"""
-        model_version = version.parse(self.version)
+        # packaging is only needed for colored model tables
+        from packaging import version
+
+        try:
+            model_version = version.parse(self.version)
+        except version.InvalidVersion:
+            # Juju 1 models are "1.x.x", newer packaging refuses to parse it
+            return Color.Fg.Red + self.version + Color.Reset
+        latest_version = version.parse(Model.latest_juju_version)
         if (
             model_version < version.parse("2.0.0")
-            or model_version > Model.latest_juju_version
+            or model_version > latest_version
         ):
             return Color.Fg.Red + self.version + Color.Reset
-        elif model_version < Model.latest_juju_version:
+        elif model_version < latest_version:
             return Color.Fg.Yellow + self.version + Color.Reset
         else:
             return Color.Fg.Green + self.version + Color.Reset
@@ -208,90 +356,112 @@ class Model:
         else:
             return Color.Fg.Yellow + self.meterstatus + Color.Reset
 
-    def get_row(
-        self, color, include_controller_name=True, include_model_name=True
-    ):
-        """Return a list which can be used for a row in a table."""
+    def get_timestamp_string(self):
+        """Return the time the status of this model was taken"""
+        return self.controller.timestamp.strftime("%H:%M:%SZ")
+
+    def get_notes(self, color):
+        """
+        Return the notes of this model, noting when the status didn't include
+        a timestamp
+        """
+        notes = list(self.notes)
         if not self.controller.timestampprovided:
             if color:
-                self.notes.append(
+                notes.append(
                     Color.Fg.Yellow + "Guessing at timestamp" + Color.Reset
                 )
             else:
-                self.notes.append("Guessing at timestamp")
-        notesstr = ", ".join(self.notes)
-        timestampstr = self.controller.timestamp.strftime("%H:%M:%SZ")
-        if color:
-            return [
-                self.name,
-                self.controller.name,
-                self.cloud,
-                self.get_version_color(),
-                self.sla,
-                timestampstr,
-                self.get_modelstatus_color(),
-                self.get_meterstatus_color(),
-                self.message,
-                notesstr,
-            ]
-        else:
-            return [
-                self.name,
-                self.controller.name,
-                self.cloud,
-                self.version,
-                self.sla,
-                timestampstr,
-                self.modelstatus,
-                self.meterstatus,
-                self.message,
-                notesstr,
-            ]
-
-    def get_column_names(
-        self, include_controller_name=True, include_model_name=True
-    ):
-        """Append the controller name and/or model name as necessary"""
-        return self.column_names
+                notes.append("Guessing at timestamp")
+        return ", ".join(notes)
 
     def filter_dictionary(self, dictionary, key_filter):
+        """Keep the items whose key matches a compiled filter"""
         return {
             key: value
             for (key, value) in dictionary.items()
-            if key_filter in key
+            if key_filter(key)
         }
 
     def filter_applications(self, app_filter):
+        """
+        Keep the applications matching the filter and the applications their
+        subordinate units are attached to, the machines are left to the
+        caller to reset
+        """
         apps = self.filter_dictionary(self.applications, app_filter)
         parent_apps = {}
-        for appname, appinfo in apps.items():
-            for subname, subinfo in appinfo.subordinates.items():
-                parent_apps[
-                    subinfo.unit.application.name
-                ] = subinfo.unit.application
+        # Pull in the applications the subordinates are attached to, a
+        # subordinate application may have been left out while loading so go
+        # through every application indexed from the status
+        for appname in self.applicationmachines:
+            if not app_filter(appname):
+                continue
+            for parentname in self.subordinateparents.get(appname, {}):
+                if parentname in self.allapplications:
+                    parent_apps[parentname] = self.allapplications[parentname]
         self.applications = {**apps, **parent_apps}
-        self.reset_machines()
+
+    def filter_machines(self, machine_filter):
+        """
+        Keep only the machines and containers matching the filter and the
+        units and subordinate units on them
+        """
+        machines = self.filter_dictionary(self.machines, machine_filter)
+        containers = self.filter_dictionary(self.containers, machine_filter)
+        unitnames = set()
+        for machinename in {**machines, **containers}:
+            unitnames.update(self.machineunits.get(machinename, ()))
+
+        applications = {}
+        for appname, application in self.applications.items():
+            if not unitnames.isdisjoint(application.get_unit_names()):
+                application.units = {
+                    unitname: unit
+                    for unitname, unit in application.units.items()
+                    if unitname in unitnames
+                }
+            elif application.get_unit_count() > 0:
+                continue
+            elif not unitnames.isdisjoint(
+                application.get_subordinate_names()
+            ):
+                application.subordinates = {
+                    subunitname: subunit
+                    for subunitname, subunit in (
+                        application.subordinates.items()
+                    )
+                    if subunitname in unitnames
+                }
+            else:
+                continue
+            applications[appname] = application
+        self.applications = applications
+
+        # Containers are shown under the machine hosting them
+        for containername, container in containers.items():
+            machines[container.machine.name] = container.machine
+        self.set_machines(machines, containers)
 
     def reset_machines(self):
+        """
+        Keep only the machines and containers the remaining applications are
+        on, this is looked up in the indexes instead of walking the units
+        """
         machines = {}
         containers = {}
-        for appname, appinfo in self.applications.items():
-            for unitname, unitinfo in appinfo.units.items():
-                if unitinfo.machine.iscontainer:
-                    containers[unitinfo.machine.name] = unitinfo.machine
-                    machines[
-                        unitinfo.machine.machine.name
-                    ] = unitinfo.machine.machine
-                else:
-                    machines[unitinfo.machine.name] = unitinfo.machine
-            for subunitname, subunitinfo in appinfo.subordinates.items():
-                if subunitinfo.machine.iscontainer:
-                    containers[subunitinfo.machine.name] = subunitinfo.machine
-                    machines[
-                        subunitinfo.machine.machine.name
-                    ] = subunitinfo.machine.machine
-                else:
-                    machines[subunitinfo.machine.name] = subunitinfo.machine
+        for appname, application in self.applications.items():
+            for machinename in self.get_application_machines(application):
+                if machinename in self.allcontainers:
+                    container = self.allcontainers[machinename]
+                    containers[machinename] = container
+                    machines[container.machine.name] = container.machine
+                elif machinename in self.allmachines:
+                    machines[machinename] = self.allmachines[machinename]
+        self.set_machines(machines, containers)
+
+    def set_machines(self, machines, containers):
+        """Replace the machines and containers of this model"""
         for machinename, machine in machines.items():
             oldcontainers = machine.containers.keys() - containers.keys()
             for containername in oldcontainers:
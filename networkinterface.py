@@ -18,16 +18,17 @@ from colors import Color
 
 
 class NetworkInterface:
-    column_names = [
-        "Machine",
-        "Interface",
-        "IP",
-        "MAC",
-        "Gateway",
-        "Space",
-        "Up",
-        "Notes",
-    ]
+    __slots__ = (
+        "space",
+        "notes",
+        "gateway",
+        "name",
+        "parent",
+        "ipaddresses",
+        "macaddress",
+        "up",
+        "model",
+    )
 
     def __init__(self, interfacename, interfaceinfo, parent, model):
         """
@@ -36,7 +37,7 @@ class NetworkInterface:
         """
         # Default Values
         self.space = ""
-        self.notes = []
+        self.notes = ()
         self.gateway = ""
 
         # Required Variables
@@ -53,58 +54,9 @@ class NetworkInterface:
         if "gateway" in interfaceinfo:
             self.gateway = interfaceinfo["gateway"]
 
-    def __dict__(self):
-        return {self.name: self}
-
     def get_isup_color(self):
         """Return a is up string with correct colors based on juju status"""
         if self.up:
             return Color.Fg.Green + str(self.up) + Color.Reset
         else:
             return Color.Fg.Red + str(self.up) + Color.Reset
-
-    def get_row(
-        self, color, include_controller_name=False, include_model_name=False
-    ):
-        """Return a list which can be used for a row in a table."""
-        row = []
-        notesstr = ", ".join(self.notes)
-        ipstr = ",".join(self.ipaddresses)
-        if color:
-            row = [
-                self.parent.name,
-                self.name,
-                ipstr,
-                self.macaddress,
-                self.gateway,
-                self.space,
-                self.get_isup_color(),
-                notesstr,
-            ]
-        else:
-            row = [
-                self.parent.name,
-                self.name,
-                ipstr,
-                self.macaddress,
-                self.gateway,
-                self.space,
-                str(self.up),
-                notesstr,
-            ]
-
-        if include_model_name:
-            row.insert(0, self.model.name)
-        if include_controller_name:
-            row.insert(0, self.model.controller.name)
-        return row
-
-    def get_column_names(
-        self, include_controller_name=False, include_model_name=False
-    ):
-        """Append the controller name and/or model name as necessary"""
-        if include_model_name:
-            self.column_names.insert(0, "Model")
-        if include_controller_name:
-            self.column_names.insert(0, "Controller")
-        return self.column_names
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import csv
+import json
+import sys
+from columns import normalize_column
+from tables import write_table
+
+
+def get_record_cells(row):
+    """
+    Return the cells of a row without the padding used to lay out the
+    console tables, such as the indent of subordinate units
+    """
+    return [cell.strip() if isinstance(cell, str) else cell for cell in row]
+
+
+class TableOutput:
+    """Write each table with a border for the console"""
+
+    # Machine readable outputs have no colors and always say which controller
+    # and model each record belongs to
+    machinereadable = False
+
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+
+    def start(self):
+        pass
+
+    def write(self, table, column_names, rows):
+        write_table(column_names, rows, self.out)
+
+    def end_table(self):
+        """Tables are separated by an empty line, even when not shown"""
+        self.out.write("\n")
+
+    def finish(self):
+        pass
+
+
+class NdjsonOutput(TableOutput):
+    """
+    Write one JSON object per line for every row as soon as it is made, with
+    a "table" member saying which table the row is from
+    """
+
+    machinereadable = True
+
+    def write(self, table, column_names, rows):
+        keys = ["table"] + [normalize_column(name) for name in column_names]
+        for row in rows:
+            record = dict(zip(keys, [table] + get_record_cells(row)))
+            self.out.write(json.dumps(record) + "\n")
+
+    def end_table(self):
+        pass
+
+
+class CsvOutput(TableOutput):
+    """Write each table as a header and its rows, separated by empty lines"""
+
+    machinereadable = True
+
+    def __init__(self, out=None):
+        TableOutput.__init__(self, out)
+        self.writer = csv.writer(self.out, lineterminator="\n")
+        self.tables = 0
+
+    def write(self, table, column_names, rows):
+        if self.tables:
+            self.writer.writerow([])
+        self.tables += 1
+        self.writer.writerow(column_names)
+        for row in rows:
+            self.writer.writerow(get_record_cells(row))
+
+    def end_table(self):
+        pass
+
+
+class JsonOutput(TableOutput):
+    """
+    Write a JSON object with a list of rows for each table, the rows are
+    written out one at a time like the NDJSON output
+    """
+
+    machinereadable = True
+
+    def __init__(self, out=None):
+        TableOutput.__init__(self, out)
+        self.tables = 0
+
+    def start(self):
+        self.out.write("{")
+
+    def write(self, table, column_names, rows):
+        keys = [normalize_column(name) for name in column_names]
+        if self.tables:
+            self.out.write(",")
+        self.tables += 1
+        self.out.write("\n" + json.dumps(table) + ": [")
+        separator = "\n"
+        for row in rows:
+            record = dict(zip(keys, get_record_cells(row)))
+            self.out.write(separator + json.dumps(record))
+            separator = ",\n"
+        self.out.write("\n]")
+
+    def end_table(self):
+        pass
+
+    def finish(self):
+        self.out.write("\n}\n")
+
+
+OUTPUTS = {
+    "table": TableOutput,
+    "ndjson": NdjsonOutput,
+    "csv": CsvOutput,
+    "json": JsonOutput,
+}
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+import gc
+import json
+import os
+import sys
+import threading
+import time
+import types
+from tables import write_table
+
+# The phases of a run in the order they are reported
+PHASES = ("parse", "dates", "load", "filter", "charmstore", "render")
+
+
+class Profiler:
+    """
+    Time the phases of a run in wall and CPU time, and optionally measure
+    the memory they allocate.  Phases may be nested, a phase doesn't include
+    the time or retained memory of the phases run inside it so the phases
+    add up to the whole run
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace = False
+        self.memory = False
+        self.started = None
+        self.snapshot = None
+        self.wall = Counter()
+        self.cpu = Counter()
+        self.peak = Counter()
+        self.retained = Counter()
+        self.maxpeak = 0
+        # The wall time, CPU time, peak memory and retained memory of the
+        # phases nested in each running phase
+        self.nested = []
+        self.events = []
+
+    def enable(self, trace=False, memory=False):
+        """
+        Start profiling, with trace each phase is also kept as an event and
+        with memory the memory allocated by python is traced
+        """
+        self.enabled = True
+        self.trace = trace
+        self.memory = memory
+        if memory:
+            import tracemalloc
+
+            tracemalloc.start()
+            self.snapshot = tracemalloc.take_snapshot()
+            memory = tracemalloc.get_traced_memory()[0]
+        self.started = (time.perf_counter(), time.process_time(), memory)
+
+    def disable(self):
+        """Stop profiling, the results are kept"""
+        if self.memory:
+            import tracemalloc
+
+            tracemalloc.stop()
+        self.enabled = False
+
+    def begin(self):
+        current = 0
+        if self.memory:
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            if self.nested:
+                self.nested[-1][2] = max(self.nested[-1][2], peak)
+            # Python 3.9 can measure the peak of each phase, before that it
+            # is the peak so far
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+        self.nested.append([0.0, 0.0, 0, 0])
+        return time.perf_counter(), time.process_time(), current
+
+    def end(self, name, started, trace=True):
+        wall = time.perf_counter() - started[0]
+        cpu = time.process_time() - started[1]
+        nestedwall, nestedcpu, nestedpeak, nestedretained = self.nested.pop()
+        self.wall[name] += wall - nestedwall
+        self.cpu[name] += cpu - nestedcpu
+        peak = retained = 0
+        if self.memory:
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, nestedpeak)
+            retained = current - started[2]
+            self.peak[name] = max(self.peak[name], peak)
+            self.retained[name] += retained - nestedretained
+            self.maxpeak = max(self.maxpeak, peak)
+        if self.nested:
+            self.nested[-1][0] += wall
+            self.nested[-1][1] += cpu
+            self.nested[-1][2] = max(self.nested[-1][2], peak)
+            self.nested[-1][3] += retained
+        if self.trace and trace:
+            self.events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (started[0] - self.started[0]) * 1e6,
+                    "dur": wall * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": {"cpu_ms": cpu * 1000},
+                }
+            )
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body of a with statement as a phase"""
+        if not self.enabled:
+            yield
+            return
+        started = self.begin()
+        try:
+            yield
+        finally:
+            self.end(name, started)
+
+    def instrument(self, module, name, phase):
+        """
+        Time every call of a function as a phase, wherever it was imported,
+        and return the original function.  These functions are called too
+        often to trace, only their calls are added up
+        """
+        function = getattr(module, name)
+
+        @wraps(function)
+        def timed(*args, **kwargs):
+            started = self.begin()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.end(phase, started, trace=False)
+
+        for loaded in list(sys.modules.values()):
+            if getattr(loaded, "__dict__", {}).get(name) is function:
+                setattr(loaded, name, timed)
+        return function
+
+    def get_phase_names(self):
+        """Return the names of the phases which ran in the order to report"""
+        return [name for name in PHASES if name in self.wall] + sorted(
+            name for name in self.wall if name not in PHASES
+        )
+
+    def write_report(self, classes=(), date_parser=None, out=None):
+        """
+        Write the time taken by each phase, the number of objects of each of
+        the classes and how many dates the cached date parser was asked for
+        """
+        if out is None:
+            out = sys.stderr
+        names = self.get_phase_names()
+        rows = [
+            [
+                name,
+                "{:.1f}".format(self.wall[name] * 1000),
+                "{:.1f}".format(self.cpu[name] * 1000),
+            ]
+            for name in names
+        ]
+        rows.append(
+            [
+                "total",
+                "{:.1f}".format(
+                    (time.perf_counter() - self.started[0]) * 1000
+                ),
+                "{:.1f}".format(
+                    (time.process_time() - self.started[1]) * 1000
+                ),
+            ]
+        )
+        write_table(["Phase", "Wall ms", "CPU ms"], rows, out)
+
+        if classes:
+            counts = count_objects(classes)
+            write_table(
+                ["Class", "Objects"],
+                [[cls.__name__, counts[cls]] for cls in classes],
+                out,
+            )
+        if date_parser is not None:
+            info = date_parser.cache_info()
+            out.write(
+                "Dates parsed: {}, {} distinct\n".format(
+                    info.hits + info.misses, info.misses
+                )
+            )
+
+    def write_memory_report(self, classes=(), top=10, out=None):
+        """
+        Write the peak and retained memory of each phase, the memory retained
+        by the objects of each of the classes and the lines of code which
+        allocated most of the memory still in use
+        """
+        import tracemalloc
+
+        if out is None:
+            out = sys.stderr
+        # Take the snapshot before measuring the objects allocates more memory
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        rows = [
+            [
+                name,
+                format_kib(self.peak[name]),
+                format_kib(self.retained[name]),
+            ]
+            for name in self.get_phase_names()
+        ]
+        rows.append(
+            [
+                "total",
+                format_kib(max(self.maxpeak, peak)),
+                format_kib(current - self.started[2]),
+            ]
+        )
+        write_table(["Phase", "Peak KiB", "Retained KiB"], rows, out)
+
+        if classes:
+            counts, sizes, largest = get_object_sizes(classes)
+            rows = []
+            for cls in sorted(classes, key=lambda cls: -sizes[cls]):
+                if not counts[cls]:
+                    continue
+                size, name = largest[cls]
+                rows.append(
+                    [
+                        cls.__name__,
+                        counts[cls],
+                        format_kib(sizes[cls]),
+                        sizes[cls] // counts[cls],
+                        "{} ({})".format(name, size),
+                    ]
+                )
+            write_table(
+                ["Class", "Objects", "KiB", "Average bytes", "Largest"],
+                rows,
+                out,
+            )
+
+        stats = snapshot.compare_to(self.snapshot, "lineno")
+        rows = []
+        for stat in stats[:top]:
+            frame = stat.traceback[0]
+            filename = os.path.basename(frame.filename)
+            rows.append(
+                [
+                    "{}:{}".format(filename, frame.lineno),
+                    format_kib(stat.size_diff),
+                    stat.count_diff,
+                ]
+            )
+        write_table(["Allocated at", "Retained KiB", "Blocks"], rows, out)
+
+    def write_trace(self, filename):
+        """Write the phases as a Chrome trace event file"""
+        with open(filename, "w") as tracefile:
+            json.dump(
+                {"traceEvents": self.events, "displayTimeUnit": "ms"},
+                tracefile,
+            )
+
+
+def format_kib(size):
+    return "{:.1f}".format(size / 1024)
+
+
+def get_size(obj, seen):
+    """
+    Return the size of an object and everything it refers to which hasn't
+    been seen yet, leaving out classes, modules and functions
+    """
+    size = 0
+    pending = [obj]
+    while pending:
+        obj = pending.pop()
+        size += sys.getsizeof(obj)
+        for referent in gc.get_referents(obj):
+            if id(referent) in seen or isinstance(
+                referent, (type, types.ModuleType, types.FunctionType)
+            ):
+                continue
+            seen.add(id(referent))
+            pending.append(referent)
+    return size
+
+
+def get_object_sizes(classes):
+    """
+    Return the number of objects of each of the classes, the memory they
+    retain and the size and name of the largest of them.  Each object counts
+    what it refers to apart from other objects of the classes, anything
+    shared is counted once for the first object referring to it
+    """
+    gc.collect()
+    objects = [obj for obj in gc.get_objects() if type(obj) in classes]
+    seen = set(id(obj) for obj in objects)
+    counts = Counter()
+    sizes = Counter()
+    largest = {}
+    for obj in objects:
+        cls = type(obj)
+        size = get_size(obj, seen)
+        counts[cls] += 1
+        sizes[cls] += size
+        if cls not in largest or size > largest[cls][0]:
+            largest[cls] = (size, getattr(obj, "name", ""))
+    return counts, sizes, largest
+
+
+def count_objects(classes):
+    """Count the objects in memory of each of the classes"""
+    # Objects dropped by the filters may still be waiting to be collected
+    gc.collect()
+    counts = Counter()
+    for obj in gc.get_objects():
+        if type(obj) in classes:
+            counts[type(obj)] += 1
+    return counts
@@ -23,10 +23,7 @@ class Relation:
     does not provide much information.
     """
 
-    column_names = [
-        "Application A",
-        "Application B"
-    ]
+    __slots__ = ("name", "application", "partner")
 
     def __init__(self, model, name, partnername, applicationname):
         """
@@ -35,45 +32,12 @@ class Relation:
         # Default Values
         self.name = name
         self.application = model.get_application(applicationname)
-        if model.get_application(partnername):
-            self.partner = model.get_application(partnername)
-        else:
+        if self.application is None:
+            # The application was filtered out while loading the model
+            self.application = Application(applicationname, {}, model)
+        self.partner = model.get_application(partnername)
+        if self.partner is None:
             self.partner = Application(partnername)
         # self.partner = self.application.model.get_application(partner)
         # if not self.partner:
         #     self.partner = partner
-
-    def __dict__(self):
-        return {self.name: self}
-
-    def get_row(
-        self, color, include_controller_name=False, include_model_name=False
-    ):
-        """Return a list which can be used for a row in a table."""
-
-        row = []
-        if color:
-            row = [
-                self.application.name + ':' + self.name,
-                self.partner.name + ':' + self.name,
-            ]
-        else:
-            row = [
-                self.application.name + ':' + self.name,
-                self.partner.name + ':' + self.name,
-            ]
-        if include_model_name:
-            row.insert(0, self.application.model.name)
-        if include_controller_name:
-            row.insert(0, self.application.model.controller.name)
-        return row
-
-    def get_column_names(
-        self, include_controller_name=False, include_model_name=False
-    ):
-        """Append the controller name and/or model name as necessary"""
-        if include_model_name:
-            self.column_names.insert(0, "Model")
-        if include_controller_name:
-            self.column_names.insert(0, "Controller")
-        return self.column_names
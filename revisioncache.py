@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from contextlib import closing
+import os
+import time
+from statuscache import get_cache_dir
+
+REVISION_CACHE_FILE = "revisions.sqlite"
+REVISION_TTL = 24 * 60 * 60
+# Revisions not refreshed for this long are removed from the cache
+MAX_REVISION_AGE = 30 * 24 * 60 * 60
+# SQLite limits how many parameters a statement can have
+QUERY_CHUNK_SIZE = 500
+
+
+class RevisionCache:
+    """
+    An on-disk cache of the latest revision of charms in the charm store,
+    entries are keyed by the charm store URL and the charm id and remember
+    when they were fetched
+    """
+
+    def __init__(self, path=None, max_age=MAX_REVISION_AGE):
+        self.path = path or os.path.join(get_cache_dir(), REVISION_CACHE_FILE)
+        self.max_age = max_age
+
+    def connect(self):
+        """Return a connection to the cache, creating it if necessary"""
+        # Offline runs never use the cache, so sqlite3 isn't imported until
+        # it is
+        import sqlite3
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS revisions ("
+            "store TEXT NOT NULL, "
+            "charmid TEXT NOT NULL, "
+            "revision INTEGER NOT NULL, "
+            "fetched REAL NOT NULL, "
+            "PRIMARY KEY (store, charmid))"
+        )
+        return connection
+
+    def load(self, store, charmids, ttl=None):
+        """
+        Return a dictionary of the cached revisions of the charm ids, only
+        those fetched within ttl seconds unless ttl is None.  Failures are
+        silently ignored
+        """
+        import sqlite3
+
+        revisions = {}
+        oldest = 0 if ttl is None else time.time() - ttl
+        charmids = list(charmids)
+        try:
+            with closing(self.connect()) as connection:
+                for start in range(0, len(charmids), QUERY_CHUNK_SIZE):
+                    end = start + QUERY_CHUNK_SIZE
+                    chunk = charmids[start:end]
+                    rows = connection.execute(
+                        "SELECT charmid, revision FROM revisions "
+                        "WHERE store = ? AND fetched >= ? "
+                        "AND charmid IN ({})".format(
+                            ",".join("?" * len(chunk))
+                        ),
+                        [store, oldest] + chunk,
+                    )
+                    revisions.update(rows)
+        except (OSError, sqlite3.Error):
+            return {}
+        return revisions
+
+    def store(self, store, revisions):
+        """
+        Store freshly fetched revisions and remove any which have not been
+        refreshed for the maximum age, failures are silently ignored
+        """
+        import sqlite3
+
+        now = time.time()
+        try:
+            with closing(self.connect()) as connection:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO revisions "
+                        "VALUES (?, ?, ?, ?)",
+                        (
+                            (store, charmid, revision, now)
+                            for charmid, revision in revisions.items()
+                        ),
+                    )
+                    connection.execute(
+                        "DELETE FROM revisions WHERE fetched < ?",
+                        (now - self.max_age,),
+                    )
+        except (OSError, sqlite3.Error):
+            return
@@ -18,7 +18,6 @@ import setuptools
 
 # requirements = [
 #     'PyYAML>=3.13',
-#     'prettytable>=0.7.2',
 #     'click>=7.0',
 #     'packaging>=19.0',
 #     'requests>=2.21.0',
@@ -31,16 +30,32 @@ setuptools.setup(
     scripts=[
         "xjs",
         "application.py",
+        "archives.py",
         "basicmachine.py",
         "basicunit.py",
+        "charmstore.py",
         "colors.py",
+        "columns.py",
         "container.py",
         "controller.py",
+        "dates.py",
+        "empty.py",
+        "filters.py",
         "machine.py",
         "model.py",
         "networkinterface.py",
+        "outputs.py",
+        "profiling.py",
         "relation.py",
+        "revisioncache.py",
+        "sorting.py",
+        "statuscache.py",
+        "statusdiff.py",
+        "statusfile.py",
         "subordinateunit.py",
+        "tables.py",
         "unit.py",
+        "watch.py",
+        "xjsversion.py",
     ],
 )
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from functools import lru_cache
+import re
+from columns import normalize_column
+
+ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
+DIGITS_RE = re.compile(r"(\d+)")
+NATURAL_KEY_CACHE_SIZE = 65536
+
+# Statuses sort from the most to the least severe, anything not listed sorts
+# between the bad and the good ones
+STATUS_COLUMNS = (
+    "status",
+    "workload",
+    "agent",
+    "model-status",
+    "meter-status",
+)
+STATUS_SEVERITY = {
+    status: rank
+    for rank, status in enumerate(
+        (
+            "error",
+            "provisioning error",
+            "blocked",
+            "lost",
+            "down",
+            "failed",
+            "red",
+            "terminated",
+            "stopped",
+            "maintenance",
+            "executing",
+            "waiting",
+            "pending",
+            "allocating",
+            "rebooting",
+            "amber",
+            "unknown",
+            "",
+        )
+    )
+}
+UNLISTED_SEVERITY = len(STATUS_SEVERITY)
+for rank, status in enumerate(
+    ("idle", "started", "running", "available", "active", "green"),
+    start=UNLISTED_SEVERITY + 1,
+):
+    STATUS_SEVERITY[status] = rank
+
+
+@lru_cache(maxsize=NATURAL_KEY_CACHE_SIZE)
+def natural_key(text):
+    """
+    Return a key ordering text with the numbers in it compared by value, so
+    ceph-osd/2 sorts before ceph-osd/10 and machine 2 before 10
+    """
+    parts = DIGITS_RE.split(text.lower())
+    parts[1::2] = map(int, parts[1::2])
+    return tuple(parts)
+
+
+def get_cell_text(cell):
+    """Return the text of a table cell without colors or padding"""
+    text = cell if isinstance(cell, str) else str(cell)
+    if "\x1b" in text:
+        text = ANSI_ESCAPE_RE.sub("", text)
+    return text.strip()
+
+
+def get_name_key(cell):
+    """Return the natural sort key of a table cell"""
+    # Leaders are marked with a *
+    return natural_key(get_cell_text(cell).rstrip("*"))
+
+
+def get_status_key(cell):
+    """Return the sort key of a status cell, most severe first"""
+    text = get_cell_text(cell)
+    return (STATUS_SEVERITY.get(text, UNLISTED_SEVERITY), natural_key(text))
+
+
+def get_key_function(column):
+    """Return the function making sort keys for a normalized column"""
+    if column in STATUS_COLUMNS:
+        return get_status_key
+    return get_name_key
+
+
+def parse_sort_options(sortoptions, tablecolumns):
+    """
+    Parse --sort values of the form [table:]column[,column...] where a
+    column starting with - sorts in descending order.  tablecolumns maps the
+    name of each table to its column names.  Returns a list of
+    (table, [(column, descending)]) with a table of None for every table,
+    raises a ValueError for an unknown table or column
+    """
+    sortspecs = []
+    for sortoption in sortoptions:
+        table = None
+        columns = sortoption
+        if ":" in sortoption:
+            table, columns = sortoption.split(":", 1)
+            table = table.strip().lower()
+            if table not in tablecolumns:
+                raise ValueError(
+                    "Unknown table {} to sort, use one of {}".format(
+                        table, ", ".join(tablecolumns)
+                    )
+                )
+            known = tablecolumns[table]
+        else:
+            known = [
+                name for names in tablecolumns.values() for name in names
+            ]
+        known = {normalize_column(name) for name in known}
+
+        sortcolumns = []
+        for column in columns.split(","):
+            column = column.strip()
+            descending = column.startswith("-")
+            column = normalize_column(column.lstrip("-"))
+            if not column:
+                continue
+            if column not in known:
+                raise ValueError("Unknown column {} to sort".format(column))
+            sortcolumns.append((column, descending))
+        sortspecs.append((table, sortcolumns))
+    return sortspecs
+
+
+def get_sort_columns(sortspecs, table):
+    """Return the (column, descending) pairs which apply to a table"""
+    sortcolumns = []
+    for spectable, columns in sortspecs:
+        if spectable is None or spectable == table:
+            sortcolumns.extend(columns)
+    return sortcolumns
+
+
+def sort_entries(entries, directions):
+    """
+    Sort (keys, row) pairs in place, the keys hold one key per sort column
+    and directions says which of those columns are descending
+    """
+    if len(entries) < 2:
+        return
+    if not any(directions):
+        entries.sort(key=lambda entry: entry[0])
+    elif all(directions):
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+    else:
+        # Sort by the last column first, the sort is stable so the earlier
+        # columns take precedence
+        for position in reversed(range(len(directions))):
+            entries.sort(
+                key=lambda entry: entry[0][position],
+                reverse=directions[position],
+            )
+
+
+def sort_rows(rows, column_names, sortcolumns, children=None):
+    """
+    Return table rows sorted by the given (column, descending) pairs,
+    columns which are not in the table are ignored.  Rows flagged in
+    children, such as subordinate units and containers, stay under the row
+    before them and are sorted amongst themselves
+    """
+    normalized = [normalize_column(name) for name in column_names]
+    indexes = []
+    directions = []
+    for column, descending in sortcolumns:
+        if column in normalized:
+            indexes.append(
+                (normalized.index(column), get_key_function(column))
+            )
+            directions.append(descending)
+    if not indexes:
+        return rows
+
+    # Work out the keys of every row once
+    groups = []
+    for position, row in enumerate(rows):
+        keys = tuple(keyfunction(row[index]) for index, keyfunction in indexes)
+        if children and children[position] and groups:
+            groups[-1][1][1].append((keys, row))
+        else:
+            groups.append((keys, (row, [])))
+
+    sort_entries(groups, directions)
+    sortedrows = []
+    for keys, (parent, childentries) in groups:
+        sort_entries(childentries, directions)
+        sortedrows.append(parent)
+        sortedrows.extend(row for keys, row in childentries)
+    return sortedrows
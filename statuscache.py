@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import os
+import pickle
+import sys
+import time
+from xjsversion import __version__
+
+# Bump this whenever the pickled objects change shape
+CACHE_FORMAT = 8
+MAX_CACHE_SIZE = 512 * 1024 * 1024
+MAX_CACHE_AGE = 7 * 24 * 60 * 60
+CACHE_SUFFIX = ".pickle"
+
+
+def get_cache_dir():
+    """Return the xjs cache directory following the XDG base directory spec"""
+    cachehome = os.environ.get("XDG_CACHE_HOME")
+    if not cachehome:
+        cachehome = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cachehome, "xjs")
+
+
+class StatusCache:
+    """
+    An on-disk cache of parsed juju status files, entries are keyed by a hash
+    of the file content and the xjs version and hold the fully built model
+    """
+
+    def __init__(
+        self, directory=None, max_size=MAX_CACHE_SIZE, max_age=MAX_CACHE_AGE
+    ):
+        self.directory = directory or get_cache_dir()
+        self.max_size = max_size
+        self.max_age = max_age
+
+    def get_key(self, text, variant=""):
+        """
+        Return the cache key for the text of a status file, the variant tells
+        apart entries built differently from the same text
+        """
+        digest = hashlib.sha256()
+        digest.update(
+            "xjs-{}-{}-py{}.{}-{}\n".format(
+                __version__,
+                CACHE_FORMAT,
+                sys.version_info.major,
+                sys.version_info.minor,
+                variant,
+            ).encode()
+        )
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get_path(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def load(self, key):
+        """Return the cached entry for a key or None if there isn't one"""
+        path = self.get_path(key)
+        try:
+            with open(path, "rb") as cachefile:
+                entry = pickle.load(cachefile)
+            # Keep recently used entries from being evicted
+            os.utime(path)
+        except Exception:
+            return None
+        return entry
+
+    def store(self, key, entry):
+        """Store an entry in the cache, failures are silently ignored"""
+        # tempfile is slow to import and only needed when storing
+        import tempfile
+
+        tmppath = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmppath = tempfile.mkstemp(
+                dir=self.directory, suffix=".tmp"
+            )
+            with os.fdopen(fd, "wb") as cachefile:
+                pickle.dump(entry, cachefile, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmppath, self.get_path(key))
+            tmppath = None
+        except Exception:
+            return
+        finally:
+            if tmppath:
+                try:
+                    os.unlink(tmppath)
+                except OSError:
+                    pass
+        self.evict()
+
+    def evict(self):
+        """
+        Remove entries older than the maximum age then remove the least
+        recently used entries until the cache fits in the maximum size
+        """
+        now = time.time()
+        entries = []
+        try:
+            with os.scandir(self.directory) as scan:
+                for direntry in scan:
+                    if direntry.name.endswith(CACHE_SUFFIX):
+                        stat = direntry.stat()
+                        entries.append(
+                            (stat.st_mtime, stat.st_size, direntry.path)
+                        )
+        except OSError:
+            return
+
+        entries.sort()
+        totalsize = sum(size for mtime, size, path in entries)
+        for mtime, size, path in entries:
+            if now - mtime <= self.max_age and totalsize <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            totalsize -= size
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import json
+
+# The kinds of entity compared, in the order their changes are reported
+ENTITY_TYPES = (
+    "model",
+    "application",
+    "unit",
+    "subordinate",
+    "machine",
+    "container",
+    "nic",
+    "relation",
+)
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+# These hold other entities which are compared on their own
+CHILD_KEYS = frozenset(
+    ("units", "subordinates", "relations", "containers", "network-interfaces")
+)
+
+
+def get_content(info):
+    """Return the raw info of an entity without the entities it holds"""
+    return {key: value for key, value in info.items() if key not in CHILD_KEYS}
+
+
+def add_machine(entities, machinetype, machinename, machineinfo):
+    entities[machinetype][machinename] = get_content(machineinfo)
+    for nicname, nicinfo in machineinfo.get("network-interfaces", {}).items():
+        entities["nic"]["{}:{}".format(machinename, nicname)] = nicinfo
+
+
+def get_model_identity(rawstatus):
+    """
+    Return the controller and model names of a raw juju status, juju 1
+    status files have no controller name
+    """
+    if "model" not in rawstatus and "services" in rawstatus:
+        return "", rawstatus.get("environment", "")
+    modelinfo = rawstatus.get("model") or {}
+    return modelinfo.get("controller", ""), modelinfo.get("name", "")
+
+
+def get_entities(rawstatus):
+    """
+    Return an index of every entity in a raw juju status by type and name,
+    each with its raw info less the entities it holds.  Juju 1 and 2 status
+    files are both indexed under the juju 2 names
+    """
+    if "model" not in rawstatus and "services" in rawstatus:
+        modelinfo = rawstatus.get("environment-status", {})
+        modelname = rawstatus.get("environment", "")
+        appsinfo = rawstatus["services"]
+    else:
+        modelinfo = rawstatus["model"]
+        modelname = modelinfo.get("name", "")
+        appsinfo = rawstatus["applications"]
+
+    entities = {entitytype: {} for entitytype in ENTITY_TYPES}
+    entities["model"][modelname] = modelinfo
+    for appname, appinfo in appsinfo.items():
+        entities["application"][appname] = get_content(appinfo)
+        for unitname, unitinfo in appinfo.get("units", {}).items():
+            entities["unit"][unitname] = get_content(unitinfo)
+            for subname, subinfo in unitinfo.get("subordinates", {}).items():
+                entities["subordinate"][subname] = get_content(subinfo)
+        for relationname, partners in appinfo.get("relations", {}).items():
+            for partner in partners:
+                name = "{}:{} -> {}".format(appname, relationname, partner)
+                entities["relation"][name] = {}
+
+    for machinename, machineinfo in rawstatus.get("machines", {}).items():
+        add_machine(entities, "machine", machinename, machineinfo)
+        for containername, containerinfo in machineinfo.get(
+            "containers", {}
+        ).items():
+            add_machine(entities, "container", containername, containerinfo)
+    return entities
+
+
+def flatten(info, prefix="", fields=None):
+    """
+    Return the values of a raw info by their dotted path, such as
+    workload-status.current.  Lists are values of their own
+    """
+    if fields is None:
+        fields = {}
+    for key, value in info.items():
+        path = prefix + str(key)
+        if isinstance(value, dict):
+            flatten(value, path + ".", fields)
+        else:
+            fields[path] = value
+    return fields
+
+
+def format_value(value):
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+
+def get_details(oldinfo, newinfo):
+    """Return a line for every field which differs between two raw infos"""
+    oldfields = flatten(oldinfo)
+    newfields = flatten(newinfo)
+    lines = []
+    for path, value in newfields.items():
+        if path not in oldfields:
+            lines.append("{}: {}".format(path, format_value(value)))
+        elif oldfields[path] != value:
+            lines.append(
+                "{}: {} -> {}".format(
+                    path, format_value(oldfields[path]), format_value(value)
+                )
+            )
+    for path in oldfields:
+        if path not in newfields:
+            lines.append("{}: removed".format(path))
+    return lines
+
+
+def diff_status(oldstatus, newstatus):
+    """
+    Yield (entity type, name, change, details) for every entity added,
+    removed or changed between two raw status files of a model.  Entities
+    are matched by name through a dictionary and compared field by field
+    only if their raw info differs, so this is linear in the size of the
+    status files
+    """
+    oldentities = get_entities(oldstatus)
+    newentities = get_entities(newstatus)
+    for entitytype in ENTITY_TYPES:
+        old = oldentities[entitytype]
+        new = newentities[entitytype]
+        for name, info in new.items():
+            if name not in old:
+                yield entitytype, name, ADDED, []
+            elif old[name] != info:
+                yield entitytype, name, CHANGED, get_details(old[name], info)
+        for name in old:
+            if name not in new:
+                yield entitytype, name, REMOVED, []
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import re
+import sys
+
+first_char_re = re.compile(r"\s*(\S)")
+
+
+def sniff_format(text):
+    """
+    Return "json" or "yaml" depending on the first non-whitespace character of
+    a status file
+    """
+    match = first_char_re.match(text)
+    if match and match.group(1) in "{[":
+        return "json"
+    return "yaml"
+
+
+def get_yaml_loader():
+    """
+    Return the yaml module, the loader to use and the name of its backend.
+    yaml is only imported when a status file needs it, JSON files don't
+    """
+    import yaml
+
+    # Prefer the libyaml bindings, they are an order of magnitude faster than
+    # the pure python loader but are not always compiled in
+    try:
+        return yaml, yaml.CSafeLoader, "libyaml"
+    except AttributeError:
+        return yaml, yaml.SafeLoader, "pyyaml"
+
+
+def parse_status(text, verbose=False, name="<status>"):
+    """
+    Parse the text of a juju status file and return the raw status dictionary,
+    raises a ValueError if the text can't be parsed
+    """
+    rawstatus = None
+    backend = None
+
+    if sniff_format(text) == "json":
+        try:
+            rawstatus = json.loads(text)
+            backend = "json"
+        except ValueError:
+            # YAML is a superset of JSON, let the yaml loader have a go
+            pass
+
+    if backend is None:
+        yaml, yamlloader, yamlbackend = get_yaml_loader()
+        try:
+            rawstatus = yaml.load(text, Loader=yamlloader)
+            backend = yamlbackend
+        except yaml.YAMLError as error:
+            raise ValueError(str(error))
+        except Exception:
+            if yamlloader is yaml.SafeLoader:
+                raise
+            # Fall back to the pure python loader
+            try:
+                rawstatus = yaml.safe_load(text)
+                backend = "pyyaml"
+            except yaml.YAMLError as error:
+                raise ValueError(str(error))
+
+    if verbose:
+        print(
+            "Loaded {} with the {} parser".format(name, backend),
+            file=sys.stderr,
+        )
+
+    if not isinstance(rawstatus, dict):
+        raise ValueError("{} is not a juju status file".format(name))
+    return rawstatus
@@ -16,9 +16,17 @@
 
 import re
 from basicunit import BasicUnit
+from empty import EMPTY_DICT
 
 
 class SubordinateUnit(BasicUnit):
+    __slots__ = (
+        "subordinates",
+        "unit",
+        "upgradingfrom",
+        "machine",
+        "application",
+    )
     issubordinate = True
 
     def __init__(self, subunitname, subunitinfo, unit):
@@ -31,6 +39,9 @@ class SubordinateUnit(BasicUnit):
             self, subunitname, subunitinfo, unit.application.model.controller
         )
 
+        # Default Values
+        self.subordinates = EMPTY_DICT
+
         # Required Variables
         self.unit = unit
         self.upgradingfrom = subunitinfo["upgrading-from"]
@@ -41,44 +52,3 @@ class SubordinateUnit(BasicUnit):
         self.application = self.unit.application.model.get_application(appname)
         if self.application is not None:
             self.application.add_subordinate(self)
-
-    def get_row(
-        self, color, include_controller_name=False, include_model_name=False
-    ):
-        """Return a list which can be used for a row in a table."""
-        row = []
-        notesstr = ", ".join(self.notes)
-        namestr = "  " + self.name
-        portsstr = ",".join(self.openports)
-
-        if self.leader:
-            namestr += "*"
-
-        if color:
-            row = [
-                namestr,
-                self.get_workloadstatus_color(),
-                self.get_jujustatus_color(),
-                "",
-                self.publicaddress,
-                portsstr,
-                self.message,
-                notesstr,
-            ]
-        else:
-            row = [
-                namestr,
-                self.workloadstatus,
-                self.jujustatus,
-                "",
-                self.publicaddress,
-                portsstr,
-                self.message,
-                notesstr,
-            ]
-
-        if include_model_name:
-            row.insert(0, self.unit.application.model.name)
-        if include_controller_name:
-            row.insert(0, self.unit.application.model.controller.name)
-        return row
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import re
+import sys
+import unicodedata
+
+ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
+NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+# Rows are joined and written in chunks rather than one write per line
+WRITE_CHUNK_ROWS = 512
+
+
+def get_text_width(text):
+    """
+    Return the width of a single line of text on the terminal, ignoring color
+    codes and counting wide east asian characters twice
+    """
+    if "\x1b" in text:
+        text = ANSI_ESCAPE_RE.sub("", text)
+    if not NON_ASCII_RE.search(text):
+        return len(text)
+    width = 0
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        if unicodedata.east_asian_width(char) in ("W", "F"):
+            width += 2
+        else:
+            width += 1
+    return width
+
+
+def measure_row(row):
+    """
+    Return a row as a tuple of (text, visible width) cells, multi-line cells
+    are as wide as their longest line
+    """
+    cells = []
+    for value in row:
+        text = value if isinstance(value, str) else str(value)
+        if "\t" in text:
+            text = text.expandtabs()
+        if "\n" in text:
+            width = max(get_text_width(line) for line in text.split("\n"))
+        else:
+            width = get_text_width(text)
+        cells.append((text, width))
+    return tuple(cells)
+
+
+def format_row(cells, widths):
+    """Return the lines of a measured row padded to the column widths"""
+    if not any("\n" in text for text, width in cells):
+        return (
+            "| "
+            + " | ".join(
+                text + " " * (columnwidth - width)
+                for (text, width), columnwidth in zip(cells, widths)
+            )
+            + " |\n"
+        )
+
+    # Multi-line cells make the row taller, shorter cells are padded with
+    # empty lines at the bottom
+    celllines = [text.split("\n") for text, width in cells]
+    height = max(len(lines) for lines in celllines)
+    rowlines = []
+    for y in range(height):
+        parts = []
+        for lines, columnwidth in zip(celllines, widths):
+            line = lines[y] if y < len(lines) else ""
+            parts.append(line + " " * (columnwidth - get_text_width(line)))
+        rowlines.append("| " + " | ".join(parts) + " |\n")
+    return "".join(rowlines)
+
+
+def write_table(column_names, rows, out=None):
+    """
+    Write a left aligned table with a border to out, stdout by default.  The
+    column widths are worked out from the visible width of every cell before
+    the rows are written out in chunks
+    """
+    if out is None:
+        out = sys.stdout
+    header = measure_row(column_names)
+    widths = [width for text, width in header]
+    measured = []
+    for row in rows:
+        cells = measure_row(row)
+        for index, (text, width) in enumerate(cells):
+            if width > widths[index]:
+                widths[index] = width
+        measured.append(cells)
+
+    hrule = "+" + "+".join("-" * (width + 2) for width in widths) + "+\n"
+    chunk = [hrule, format_row(header, widths), hrule]
+    for cells in measured:
+        chunk.append(format_row(cells, widths))
+        if len(chunk) >= WRITE_CHUNK_ROWS:
+            out.write("".join(chunk))
+            chunk = []
+    chunk.append(hrule)
+    out.write("".join(chunk))
@@ -16,10 +16,17 @@
 
 import re
 from basicunit import BasicUnit
+from empty import EMPTY_DICT
 from subordinateunit import SubordinateUnit
 
 
 class Unit(BasicUnit):
+    __slots__ = (
+        "application",
+        "machine",
+        "subordinatesinfo",
+        "_subordinates",
+    )
     issubordinate = False
 
     def __init__(self, unitname, unitinfo, application):
@@ -43,66 +50,51 @@ class Unit(BasicUnit):
         else:
             self.machine = None
 
-        # Handle Subordinate Charms if any
+        # Subordinate Charms are only created when they are first used but
+        # the controller needs their dates now
+        self.subordinatesinfo = EMPTY_DICT
+        self._subordinates = None
         if "subordinates" in unitinfo:
-            for subunitname, subunitinfo in unitinfo["subordinates"].items():
-                self.subordinates[subunitname] = SubordinateUnit(
-                    subunitname, subunitinfo, self
+            self.subordinatesinfo = unitinfo["subordinates"]
+            for subunitinfo in self.subordinatesinfo.values():
+                BasicUnit.record_dates(
+                    subunitinfo, application.model.controller
                 )
 
-    def get_row(
-        self, color, include_controller_name=False, include_model_name=False
-    ):
-        """Return a list which can be used for a row in a table."""
-        row = []
-        notesstr = ", ".join(self.notes)
-        namestr = self.name
-        portsstr = ",".join(self.openports)
-        if self.machine:
-            machinename = self.machine.name
-        else:
-            machinename = "PENDING"
-
-        if self.leader:
-            namestr += "*"
+    @property
+    def subordinates(self):
+        """The subordinate units of this unit keyed by unit name"""
+        if self._subordinates is None:
+            self.create_subordinates()
+        return self._subordinates
 
-        if color:
-            row = [
-                namestr,
-                self.get_workloadstatus_color(),
-                self.get_jujustatus_color(),
-                machinename,
-                self.publicaddress,
-                portsstr,
-                self.message,
-                notesstr,
-            ]
-        else:
-            row = [
-                namestr,
-                self.workloadstatus,
-                self.jujustatus,
-                machinename,
-                self.publicaddress,
-                portsstr,
-                self.message,
-                notesstr,
-            ]
+    @subordinates.setter
+    def subordinates(self, subordinates):
+        self._subordinates = subordinates
 
-        if include_model_name:
-            row.insert(0, self.application.model.name)
-        if include_controller_name:
-            row.insert(0, self.application.model.controller.name)
-        return row
+    def create_subordinates(self, subunit_filter=None):
+        """Create the subordinate units matching a compiled filter, or all"""
+        self._subordinates = {}
+        for subunitname, subunitinfo in self.subordinatesinfo.items():
+            if subunit_filter is None or subunit_filter(subunitname):
+                self._subordinates[subunitname] = SubordinateUnit(
+                    subunitname, subunitinfo, self
+                )
+        self.subordinatesinfo = EMPTY_DICT
 
     def filter_dictionary(self, dictionary, key_filter):
+        """Keep the items whose key matches a compiled filter"""
         return {
             key: value
             for (key, value) in dictionary.items()
-            if key_filter in key
+            if key_filter(key)
         }
 
     def filter_subordinates(self, subunit_filter):
-        self.subordinates = self.filter_dictionary(
-            self.subordinates, subunit_filter
-        )
+        if self._subordinates is None:
+            # Only create the subordinate units which are going to be kept
+            self.create_subordinates(subunit_filter)
+        else:
+            self.subordinates = self.filter_dictionary(
+                self.subordinates, subunit_filter
+            )
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# This file is part of xjs a tool used to disply offline juju status
+# Copyright 2019 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import select
+import sys
+import time
+
+# Status files are told apart from anything else in a watched directory by
+# their extension
+STATUS_FILE_EXTENSIONS = (".json", ".yaml", ".yml")
+POLL_INTERVAL = 2.0
+# Move to the top left of the terminal and clear it
+CLEAR_SCREEN = "\033[H\033[2J"
+# Wait this long after the last change before reading anything, a file is
+# often written in several goes
+SETTLE_TIME = 0.2
+
+# inotify flags from <sys/inotify.h>, files which are written in place,
+# renamed over or deleted
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+
+def get_signature(path):
+    """
+    Return what changes when a file is written or replaced, or None if it
+    doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class Inotify:
+    """The Linux inotify API through ctypes, raises OSError without it"""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        self.libc = ctypes.CDLL(
+            ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+        )
+        try:
+            self.fd = self.libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        except AttributeError:
+            raise OSError("inotify is not available")
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, path, mask=IN_WATCH_MASK):
+        import ctypes
+
+        if self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+
+    def wait(self, timeout=None):
+        """
+        Wait for events and read them all, return False if none came before
+        the timeout.  The events themselves are not needed, the watcher
+        looks at what changed
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+
+class StatusWatcher:
+    """
+    Watch status files and directories of status files for changes, with
+    inotify where there is one and by checking every interval otherwise
+    """
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = paths
+        self.interval = interval
+        self.signatures = self.get_signatures()
+        self.inotify = None
+        try:
+            inotify = Inotify()
+            # Files are often replaced rather than written in place, which
+            # only the directory they are in sees
+            for path in set(self.get_directories()):
+                inotify.add_watch(path)
+            self.inotify = inotify
+        except OSError as error:
+            print(
+                "Watching for changes every {} seconds, inotify is not "
+                "available: {}".format(interval, error),
+                file=sys.stderr,
+            )
+
+    def get_directories(self):
+        for path in self.paths:
+            if os.path.isdir(path):
+                yield path
+            else:
+                yield os.path.dirname(os.path.abspath(path))
+
+    def get_files(self):
+        """
+        Return the status files being watched, the files in the watched
+        directories are in name order
+        """
+        files = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                files.extend(
+                    os.path.join(path, name)
+                    for name in sorted(os.listdir(path))
+                    if name.endswith(STATUS_FILE_EXTENSIONS)
+                    and os.path.isfile(os.path.join(path, name))
+                )
+            else:
+                files.append(path)
+        return files
+
+    def get_signatures(self):
+        return {path: get_signature(path) for path in self.get_files()}
+
+    def wait(self):
+        """Block until any of the watched status files have changed"""
+        while True:
+            if self.inotify is not None:
+                self.inotify.wait()
+                while self.inotify.wait(SETTLE_TIME):
+                    pass
+            else:
+                time.sleep(self.interval)
+            signatures = self.get_signatures()
+            if signatures != self.signatures:
+                self.signatures = signatures
+                return